@@ -2,6 +2,7 @@ from rest_framework import serializers
 
 from care_quick_assign.models.auto_assignment_event import AutoAssignmentEvent
 from care_quick_assign.models.auto_assignment_config import AutoAssignmentConfig
+from care_quick_assign.models.assignment_profile import AssignmentProfile
 
 
 class AssignmentEventSerializer(serializers.ModelSerializer):
@@ -12,12 +13,37 @@ class AssignmentEventSerializer(serializers.ModelSerializer):
         fields = ["patient", "failure_reason", "retry_count"]
 
 
+class AssignmentStatusSerializer(serializers.ModelSerializer):
+    patient = serializers.CharField(source="patient.external_id")
+    assigned_staff = serializers.CharField(
+        source="assigned_staff.external_id", default=None
+    )
+
+    class Meta:
+        model = AutoAssignmentEvent
+        fields = [
+            "patient",
+            "status",
+            "failure_reason",
+            "assigned_staff",
+            "retry_count",
+            "execution_time_ms",
+            "triggered_at",
+            "completed_at",
+        ]
+
+
 
 
 class AutoAssignmentConfigSerializer(serializers.ModelSerializer):
+    facility = serializers.CharField(
+        source="facility.external_id", default=None, read_only=True
+    )
+
     class Meta:
         model = AutoAssignmentConfig
         fields = [
+            "facility",
             "enabled",
             "max_patients_per_staff",
             "skill_weight",
@@ -27,3 +53,15 @@ class AutoAssignmentConfigSerializer(serializers.ModelSerializer):
             "retry_attempts",
             "window_size"
         ]
+
+
+
+
+class AssignmentProfileSerializer(serializers.ModelSerializer):
+    id = serializers.UUIDField(source="external_id", read_only=True)
+    patient = serializers.CharField(source="patient.external_id")
+    facility = serializers.CharField(source="facility.external_id", default=None)
+
+    class Meta:
+        model = AssignmentProfile
+        fields = ["id", "patient", "facility", "duration_ms", "created_date"]
@@ -4,14 +4,15 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 
-from django.forms.models import model_to_dict
-
+from care.facility.models.facility import Facility
 from care.utils.shortcuts import get_object_or_404
 
 from care_quick_assign.settings import plugin_settings
 from care_quick_assign.models.auto_assignment_event import AutoAssignmentEvent, AutoAssignmentEventStatus
-from care_quick_assign.models.auto_assignment_config import AutoAssignmentConfig
-from care_quick_assign.api.serializers import AssignmentEventSerializer
+from care_quick_assign.config_resolver import resolve_assignment_config
+from care_quick_assign.api.serializers import AssignmentEventSerializer, AssignmentStatusSerializer
+from care_quick_assign.notifications import wait_for_assignment_finalized
+from care_quick_assign.routers import replica_reads
 from care_quick_assign.tasks import create_quick_assignment
 
 
@@ -22,12 +23,13 @@ class AssignmentViewSet(GenericViewSet):
 
     @action(detail=False, methods=["get"])
     def unassigned(self, request, *args, **kwargs):
-        failed_assignments = AutoAssignmentEvent.objects.filter(
-            status=AutoAssignmentEventStatus.FAILED
-        ).select_related("patient")
+        with replica_reads():
+            failed_assignments = AutoAssignmentEvent.objects.filter(
+                status=AutoAssignmentEventStatus.FAILED
+            ).select_related("patient")
 
-        serializer = self.get_serializer(failed_assignments, many=True)
-        return Response(serializer.data)
+            serializer = self.get_serializer(failed_assignments, many=True)
+            return Response(serializer.data)
 
 
     @action(detail=False, methods=["post"], url_path=r"unassigned/(?P<patient_id>[^/.]+)/retry")
@@ -35,12 +37,13 @@ class AssignmentViewSet(GenericViewSet):
         patient_id = kwargs.get("patient_id")
         assignment_event_log = get_object_or_404(AutoAssignmentEvent, patient__external_id=patient_id)
 
-        auto_assignment_config = AutoAssignmentConfig.objects.first()
+        facility = Facility.objects.filter(
+            geo_organization=assignment_event_log.patient.geo_organization
+        ).first()
+        _, config_snapshot = resolve_assignment_config(facility.id if facility else None)
 
-        if not auto_assignment_config:
-            raise ValueError({ "error": "Quick assign feature not configured" }, status=status.HTTP_404_NOT_FOUND)
-
-        config_snapshot = model_to_dict(auto_assignment_config, exclude=["enabled"])
+        if not config_snapshot:
+            return Response({"error": "Quick assign feature not configured"}, status=status.HTTP_404_NOT_FOUND)
 
         if assignment_event_log.retry_count >= config_snapshot["retry_attempts"]:
             return Response({"error": "Max retry attempts reached for this patient."}, status=status.HTTP_400_BAD_REQUEST)
@@ -49,3 +52,36 @@ class AssignmentViewSet(GenericViewSet):
         assignment_event_log.reinitialize_for_retry()
         create_quick_assignment.delay(patient_external_id=patient_id, assignment_config=config_snapshot)
         return Response({"message": "Auto-assignment retry initiated successfully."})
+
+
+    @action(detail=False, methods=["get"], url_path=r"(?P<patient_id>[^/.]+)/status")
+    def assignment_status(self, request, *args, **kwargs):
+        """
+        Returns the quick assignment status of a patient.
+
+        By default the current status is returned immediately. Clients can opt
+        into long-polling with `wait`: while the event is pending the request
+        is then held open for up to `wait` seconds (capped by the
+        ASSIGNMENT_STATUS_MAX_WAIT setting) and answered as soon as the
+        assignment is finalized. A waiting request occupies a server worker
+        for that long.
+        """
+        patient_id = kwargs.get("patient_id")
+        queryset = AutoAssignmentEvent.objects.select_related("patient", "assigned_staff")
+        assignment_event_log = get_object_or_404(queryset, patient__external_id=patient_id)
+
+        try:
+            wait = float(request.query_params.get("wait", 0))
+        except ValueError:
+            return Response({"error": "wait must be a number of seconds."}, status=status.HTTP_400_BAD_REQUEST)
+        wait = max(0, min(wait, plugin_settings.ASSIGNMENT_STATUS_MAX_WAIT))
+
+        if (
+            assignment_event_log.status == AutoAssignmentEventStatus.PENDING
+            and wait
+            and wait_for_assignment_finalized(assignment_event_log.id, timeout=wait)
+        ):
+            assignment_event_log = queryset.get(id=assignment_event_log.id)
+
+        serializer = AssignmentStatusSerializer(assignment_event_log)
+        return Response(serializer.data)
@@ -4,26 +4,59 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from care.facility.models.facility import Facility
+from care.utils.shortcuts import get_object_or_404
+
 from care_quick_assign.models.auto_assignment_config import AutoAssignmentConfig
 from care_quick_assign.api.serializers import AutoAssignmentConfigSerializer
 
 
 class AutoAssignmentConfigViewSet(GenericViewSet):
+    """
+    Manages the global auto-assignment config, or the config of the facility
+    given by the `facility` query parameter (its external id). Facilities
+    without a config of their own use the global one.
+    """
+
     serializer_class = AutoAssignmentConfigSerializer
     permission_classes = [IsAuthenticated]
 
-    def _get_config(self, request):
-        config = AutoAssignmentConfig.objects.first()
+    def _get_facility(self, request):
+        facility_id = request.query_params.get("facility")
+        if not facility_id:
+            return None
+        return get_object_or_404(Facility, external_id=facility_id)
+
+
+    def _get_global_config(self):
+        return AutoAssignmentConfig.objects.filter(facility__isnull=True).first()
+
+
+    def _get_config(self, request, facility):
+        config = None
+        if facility:
+            config = AutoAssignmentConfig.objects.filter(facility=facility).first()
+        if config is None:
+            config = self._get_global_config()
         if config is None:
             return Response({"config": "Auto-assignment configuration not found"}, status=status.HTTP_404_NOT_FOUND)
         return Response(self.get_serializer(config).data)
 
 
-    def _upsert_config(self, request):
-        serializer = self.get_serializer(data=request.data)
+    def _upsert_config(self, request, facility):
+        data = request.data
+        if facility and not AutoAssignmentConfig.objects.filter(facility=facility).exists():
+            # A new facility config starts from the global values for any
+            # field that isn't provided.
+            global_config = self._get_global_config()
+            if global_config:
+                data = {**self.get_serializer(global_config).data, **request.data}
+
+        serializer = self.get_serializer(data=data)
         serializer.is_valid(raise_exception=True)
 
         config, created = AutoAssignmentConfig.objects.update_or_create(
+            facility=facility,
             defaults=serializer.validated_data
         )
 
@@ -33,8 +66,22 @@ class AutoAssignmentConfigViewSet(GenericViewSet):
         )
 
 
-    @action(detail=False, methods=["get", "post"])
+    def _delete_config(self, request, facility):
+        if not facility:
+            return Response({"error": "Only facility configurations can be deleted"}, status=status.HTTP_400_BAD_REQUEST)
+        # Removed outright rather than soft deleted, so the facility can be
+        # given a new config later.
+        deleted, _ = AutoAssignmentConfig.objects.filter(facility=facility).delete()
+        if not deleted:
+            return Response({"config": "Auto-assignment configuration not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+    @action(detail=False, methods=["get", "post", "delete"])
     def config(self, request, *args, **kwargs):
+        facility = self._get_facility(request)
         if request.method == "GET":
-            return self._get_config(request)
-        return self._upsert_config(request)
+            return self._get_config(request, facility)
+        if request.method == "DELETE":
+            return self._delete_config(request, facility)
+        return self._upsert_config(request, facility)
@@ -0,0 +1,61 @@
+from django.http import HttpResponse
+
+from rest_framework.viewsets import GenericViewSet
+from rest_framework.mixins import ListModelMixin
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.permissions import BasePermission, IsAuthenticated
+from rest_framework import status
+
+from care_quick_assign.models.assignment_profile import AssignmentProfile
+from care_quick_assign.api.serializers import AssignmentProfileSerializer
+from care_quick_assign.profiling import PROFILE_SORT_KEYS, dump_profile, format_profile
+
+
+class IsSuperUser(BasePermission):
+    message = "Only superusers can access assignment profiles"
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_superuser)
+
+
+class AssignmentProfileViewSet(ListModelMixin, GenericViewSet):
+    """
+    Lists the stored profiles of assignment tasks and returns them as a
+    pstats report or as a .prof file. Restricted to superusers.
+    """
+
+    serializer_class = AssignmentProfileSerializer
+    permission_classes = [IsAuthenticated, IsSuperUser]
+    lookup_field = "external_id"
+
+    def get_queryset(self):
+        queryset = AssignmentProfile.objects.select_related("patient", "facility").order_by("-created_date")
+        if self.action == "list":
+            queryset = queryset.defer("stats")
+        return queryset
+
+
+    def retrieve(self, request, *args, **kwargs):
+        profile = self.get_object()
+        try:
+            limit = int(request.query_params.get("limit", 30))
+        except ValueError:
+            return Response({"error": "limit must be a number."}, status=status.HTTP_400_BAD_REQUEST)
+        sort = request.query_params.get("sort", "cumulative")
+        if sort not in PROFILE_SORT_KEYS:
+            return Response({"error": f"sort must be one of {', '.join(sorted(PROFILE_SORT_KEYS))}."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {
+                **self.get_serializer(profile).data,
+                "report": format_profile(profile, sort=sort, limit=limit),
+            }
+        )
+
+
+    @action(detail=True, methods=["get"])
+    def download(self, request, *args, **kwargs):
+        profile = self.get_object()
+        response = HttpResponse(dump_profile(profile), content_type="application/octet-stream")
+        response["Content-Disposition"] = f'attachment; filename="assignment-{profile.external_id}.prof"'
+        return response
@@ -11,3 +11,6 @@ class CareQuickAssignConfig(AppConfig):
 
     def ready(self):
         import care_quick_assign.signals  # noqa F401
+        from care_quick_assign.periodic_tasks import register_periodic_tasks
+
+        register_periodic_tasks()
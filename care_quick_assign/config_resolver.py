@@ -0,0 +1,72 @@
+import threading
+import uuid
+
+from django.core.cache import cache
+from django.forms.models import model_to_dict
+
+from care_quick_assign.models.auto_assignment_config import AutoAssignmentConfig
+
+
+CONFIG_VERSION_CACHE_KEY = "care_quick_assign:config_version"
+
+_lock = threading.Lock()
+_configs = None
+_configs_version = None
+
+
+def _build_configs():
+    """
+    Returns the assignment configs keyed by facility id, with the global
+    default under None. Each entry is an (enabled, config snapshot) pair.
+    """
+    configs = {}
+    for config in AutoAssignmentConfig.objects.order_by("id"):
+        configs.setdefault(
+            config.facility_id,
+            (config.enabled, model_to_dict(config, exclude=["enabled", "facility"])),
+        )
+    return configs
+
+
+def _get_configs():
+    global _configs, _configs_version
+
+    version = cache.get(CONFIG_VERSION_CACHE_KEY)
+    configs = _configs
+    if configs is not None and version == _configs_version:
+        return configs
+
+    with _lock:
+        if _configs is None or version != _configs_version:
+            _configs = _build_configs()
+            _configs_version = version
+        return _configs
+
+
+def resolve_assignment_config(facility_id):
+    """
+    Returns the (enabled, config snapshot) pair of a facility, falling back
+    to the global default, or (False, None) when nothing is configured.
+
+    Configs are read from an in-process map that is built once and rebuilt
+    only after a config changes, so resolving costs no queries.
+    """
+    configs = _get_configs()
+    if facility_id in configs:
+        return configs[facility_id]
+    return configs.get(None, (False, None))
+
+
+def has_enabled_assignment_config():
+    return any(enabled for enabled, _ in _get_configs().values())
+
+
+def invalidate_assignment_configs():
+    """
+    Drops the resolved configs of this process and, through the shared cache
+    version, of every other process.
+    """
+    global _configs
+    cache.set(CONFIG_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+    with _lock:
+        _configs = None
@@ -0,0 +1,147 @@
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager, ExitStack
+
+from django.db import connections
+
+from care_quick_assign.settings import plugin_settings
+
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_local = threading.local()
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryStage:
+    def __init__(self, name, budget):
+        self.name = name
+        self.budget = budget
+        self.query_count = 0
+        self.call_sites = Counter()
+
+    def record(self, call_site):
+        self.query_count += 1
+        self.call_sites[call_site] += 1
+
+    @property
+    def over_budget(self):
+        return self.budget is not None and self.query_count > self.budget
+
+    def check(self):
+        if not self.over_budget:
+            return
+
+        call_sites = ", ".join(
+            f"{call_site} ({count}x)" for call_site, count in self.call_sites.most_common(5)
+        )
+        message = (
+            f"Stage '{self.name}' ran {self.query_count} queries, "
+            f"exceeding its budget of {self.budget}. Call sites: {call_sites}"
+        )
+        if not plugin_settings.QUERY_BUDGET_STRICT:
+            logger.warning(message)
+            return
+
+        violations = getattr(_local, "violations", None)
+        if violations is None:
+            raise QueryBudgetExceeded(message)
+        violations.append(message)
+
+
+def _stage_stack():
+    if not hasattr(_local, "stages"):
+        _local.stages = []
+    return _local.stages
+
+
+def _call_site():
+    """
+    Returns the innermost plugin frame issuing the current query, falling back
+    to the innermost frame outside of django.
+    """
+    fallback = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(PACKAGE_DIR) and filename != __file__:
+            return f"{os.path.relpath(filename, PACKAGE_DIR)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        if fallback is None and f"{os.sep}django{os.sep}" not in filename and filename != __file__:
+            fallback = f"{filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return fallback or "<unknown>"
+
+
+def _count_query(execute, sql, params, many, context):
+    stages = _stage_stack()
+    if stages:
+        stages[-1].record(_call_site())
+    return execute(sql, params, many, context)
+
+
+@contextmanager
+def enforce_query_budgets():
+    """
+    Defers strict-mode budget violations of the stages inside the block and
+    raises them together once the block has completed.
+
+    Wrapping a task in it keeps a violation from aborting the task halfway,
+    after some of its side effects (a booking, a logged result) happened.
+    """
+    if getattr(_local, "violations", None) is not None:
+        yield
+        return
+
+    _local.violations = violations = []
+    try:
+        yield
+    finally:
+        _local.violations = None
+
+    if violations:
+        raise QueryBudgetExceeded("; ".join(violations))
+
+
+@contextmanager
+def query_budget(stage, budget=None):
+    """
+    Counts the queries run inside the block, on every configured database,
+    and reports them against the stage budget (taken from the QUERY_BUDGETS
+    setting unless given).
+
+    Queries are attributed to the innermost stage only, so nested stages can
+    carve out work that is accounted for separately. When the budget is
+    exceeded a warning listing the offending call sites is logged, or
+    QueryBudgetExceeded is raised if QUERY_BUDGET_STRICT is set (deferred to
+    the end of an enclosing `enforce_query_budgets` block).
+    """
+    if budget is None:
+        budget = plugin_settings.QUERY_BUDGETS.get(stage)
+    query_stage = QueryStage(stage, budget)
+
+    if not plugin_settings.QUERY_BUDGET_ENABLED:
+        yield query_stage
+        return
+
+    stages = _stage_stack()
+    stages.append(query_stage)
+    try:
+        if len(stages) == 1:
+            with ExitStack() as wrappers:
+                for connection in connections.all():
+                    wrappers.enter_context(connection.execute_wrapper(_count_query))
+                yield query_stage
+        else:
+            yield query_stage
+    finally:
+        stages.pop()
+
+    query_stage.check()
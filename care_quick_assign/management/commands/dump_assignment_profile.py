@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from care_quick_assign.models.assignment_profile import AssignmentProfile
+from care_quick_assign.profiling import PROFILE_SORT_KEYS, dump_profile, format_profile
+
+
+class Command(BaseCommand):
+    help = "Prints a stored assignment task profile, lists recent profiles, or writes one as a .prof file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("profile_id", nargs="?", help="External id of the profile; lists recent profiles when omitted")
+        parser.add_argument("--output", help="Write the profile to this .prof file instead of printing it")
+        parser.add_argument("--sort", default="cumulative", choices=sorted(PROFILE_SORT_KEYS), help="Sort order of the report")
+        parser.add_argument("--limit", type=int, default=30, help="Number of functions in the report")
+
+    def handle(self, *args, **options):
+        if not options["profile_id"]:
+            profiles = AssignmentProfile.objects.defer("stats").order_by("-created_date")[:20]
+            for profile in profiles:
+                self.stdout.write(
+                    f"{profile.external_id}  {profile.created_date:%Y-%m-%d %H:%M:%S}  "
+                    f"{profile.duration_ms:>6} ms  facility {profile.facility_id}"
+                )
+            return
+
+        profile = AssignmentProfile.objects.filter(external_id=options["profile_id"]).first()
+        if not profile:
+            raise CommandError(f"Assignment profile {options['profile_id']} not found")
+
+        if options["output"]:
+            with open(options["output"], "wb") as output:
+                output.write(dump_profile(profile))
+            self.stdout.write(self.style.SUCCESS(f"Profile written to {options['output']}"))
+            return
+
+        self.stdout.write(format_profile(profile, sort=options["sort"], limit=options["limit"]))
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from care_quick_assign.retention import purge_successful_events
+from care_quick_assign.settings import plugin_settings
+
+
+class Command(BaseCommand):
+    help = "Compacts, archives and deletes successful auto-assignment events past the retention period"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=plugin_settings.ASSIGNMENT_EVENT_RETENTION_DAYS,
+            help="Purge events completed more than this many days ago",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=plugin_settings.ASSIGNMENT_EVENT_PURGE_BATCH_SIZE,
+            help="Number of events archived and deleted per transaction",
+        )
+        parser.add_argument(
+            "--archive-dir",
+            default=plugin_settings.ASSIGNMENT_EVENT_ARCHIVE_DIR,
+            help="Directory receiving the gzipped NDJSON archive",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many events would be purged",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            purged = purge_successful_events(
+                retention_days=options["days"],
+                batch_size=options["batch_size"],
+                archive_dir=options["archive_dir"],
+                dry_run=options["dry_run"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        if options["dry_run"]:
+            self.stdout.write(f"{purged} auto-assignment events would be purged")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Purged {purged} auto-assignment events"))
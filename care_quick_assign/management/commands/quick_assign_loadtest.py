@@ -0,0 +1,271 @@
+import itertools
+import math
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from celery import current_app
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import F
+
+from care.emr.models import TokenSlot
+from care.emr.models.patient import Patient
+from care.emr.models.scheduling import SchedulableResource, TokenBooking
+from care.emr.resources.scheduling.schedule.spec import SchedulableResourceTypeOptions
+from care.facility.models.facility import Facility
+from care.users.models import User
+from care.utils.lock import ObjectLocked
+
+from care_quick_assign.config_resolver import has_enabled_assignment_config
+from care_quick_assign.models.auto_assignment_event import AutoAssignmentEvent, AutoAssignmentEventStatus
+
+
+PERCENTILES = [50, 90, 95, 99]
+
+# Assignment failures are stored as the exception message, so lock failures
+# are recognized by the message of care's ObjectLocked.
+LOCK_FAILURE_REASON = str(ObjectLocked().detail)
+
+
+def load_test_patient_name_prefix(run_id):
+    return f"Quick Assign Load Test {run_id} #"
+
+
+def percentile(sorted_values, rank):
+    if not sorted_values:
+        return None
+    # Nearest-rank: the smallest value with at least `rank` percent of the
+    # values at or below it.
+    index = max(0, min(len(sorted_values) - 1, math.ceil(rank / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulates a patient registration burst and reports quick assignment "
+        "throughput, latency and failures. Creates real patients and "
+        "appointments; run it against a staging database only and pass "
+        "--cleanup to remove them afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--burst-size", type=int, default=100, help="Number of patients to register")
+        parser.add_argument("--workers", type=int, default=8, help="Number of concurrent registrations")
+        parser.add_argument("--facilities", type=int, default=1, help="Number of facilities to spread patients over")
+        parser.add_argument(
+            "--mode",
+            choices=["eager", "worker"],
+            default="eager",
+            help="Run assignments eagerly in the registering threads, or on the running celery workers",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=int,
+            default=300,
+            help="Seconds to wait for the workers to finish assignments in worker mode",
+        )
+        parser.add_argument("--user", help="Username registering the patients (defaults to the first superuser)")
+        parser.add_argument(
+            "--cleanup",
+            action="store_true",
+            help="Delete the patients, appointments and assignment events created by the run after reporting",
+        )
+        parser.add_argument(
+            "--cleanup-run",
+            metavar="RUN_ID",
+            help="Only delete the patients, appointments and assignment events left behind by an earlier run",
+        )
+
+    def handle(self, *args, **options):
+        if options["cleanup_run"]:
+            self._cleanup(options["cleanup_run"])
+            return
+
+        if options["burst_size"] < 1 or options["workers"] < 1 or options["facilities"] < 1:
+            raise CommandError("Burst size, workers and facilities must be at least 1")
+
+        if not has_enabled_assignment_config():
+            raise CommandError("Quick auto-assignment must be configured and enabled")
+
+        user = self._get_user(options["user"])
+        facilities = self._get_facilities(options["facilities"])
+        run_id = uuid.uuid4().hex[:8]
+        eager = options["mode"] == "eager"
+
+        self.stdout.write(
+            f"Load test {run_id}: registering {options['burst_size']} patients over "
+            f"{len(facilities)} facilities with {options['workers']} workers ({options['mode']} mode)"
+        )
+
+        query_counter = QueryCounter()
+        facility_cycle = itertools.cycle(facilities)
+        jobs = [(i, next(facility_cycle)) for i in range(options["burst_size"])]
+
+        previous_eager = current_app.conf.task_always_eager
+        current_app.conf.task_always_eager = eager
+        try:
+            started_at = time.monotonic()
+            with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+                results = list(
+                    executor.map(
+                        lambda job: self._register_patient(run_id, job[0], job[1], user, query_counter),
+                        jobs,
+                    )
+                )
+            registered_at = time.monotonic()
+        finally:
+            current_app.conf.task_always_eager = previous_eager
+
+        patient_ids = [patient_id for patient_id, _ in results if patient_id]
+        registration_errors = Counter(str(error) for _, error in results if error)
+
+        if not eager:
+            self._wait_for_workers(patient_ids, options["timeout"])
+        finished_at = time.monotonic()
+
+        self._report(
+            patient_ids=patient_ids,
+            registration_errors=registration_errors,
+            registration_time=registered_at - started_at,
+            total_time=finished_at - started_at,
+            query_count=query_counter.count if eager else None,
+        )
+
+        if options["cleanup"]:
+            self._cleanup(run_id)
+        else:
+            self.stdout.write(f"\nRemove the created records with --cleanup-run {run_id}")
+
+    def _get_user(self, username):
+        if username:
+            user = User.objects.filter(username=username).first()
+        else:
+            user = User.objects.filter(is_superuser=True).first()
+        if not user:
+            raise CommandError("No user found to register patients with")
+        return user
+
+    def _get_facilities(self, count):
+        facility_ids = SchedulableResource.objects.filter(
+            resource_type=SchedulableResourceTypeOptions.practitioner.value,
+        ).values_list("facility_id", flat=True)
+        facilities = list(
+            Facility.objects.filter(id__in=facility_ids, geo_organization__isnull=False)[:count]
+        )
+        if not facilities:
+            raise CommandError("No facilities with practitioners and a geo organization found")
+        if len(facilities) < count:
+            self.stderr.write(f"Only {len(facilities)} eligible facilities found")
+        return facilities
+
+    def _register_patient(self, run_id, index, facility, user, query_counter):
+        try:
+            with ExitStack() as wrappers:
+                for connection in connections.all():
+                    wrappers.enter_context(connection.execute_wrapper(query_counter))
+                patient = Patient.objects.create(
+                    name=f"{load_test_patient_name_prefix(run_id)}{index}",
+                    gender="non_binary",
+                    phone_number=f"+9199{index:08d}",
+                    address="Load test",
+                    permanent_address="Load test",
+                    year_of_birth=1990,
+                    geo_organization=facility.geo_organization,
+                    created_by=user,
+                    updated_by=user,
+                )
+            return patient.id, None
+        except Exception as e:
+            return None, e
+        finally:
+            connections.close_all()
+
+    def _wait_for_workers(self, patient_ids, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            finalized = AutoAssignmentEvent.objects.filter(
+                patient_id__in=patient_ids,
+            ).exclude(status=AutoAssignmentEventStatus.PENDING).count()
+            if finalized >= len(patient_ids):
+                return
+            time.sleep(1)
+        self.stderr.write("Timed out waiting for the workers; pending assignments are reported as such")
+
+    def _report(self, patient_ids, registration_errors, registration_time, total_time, query_count):
+        events = list(
+            AutoAssignmentEvent.objects.filter(patient_id__in=patient_ids).values(
+                "status", "execution_time_ms", "failure_reason"
+            )
+        )
+        statuses = Counter(event["status"] for event in events)
+        failure_reasons = Counter(event["failure_reason"] for event in events if event["failure_reason"])
+        lock_failures = failure_reasons[LOCK_FAILURE_REASON]
+        execution_times = sorted(
+            event["execution_time_ms"] for event in events if event["execution_time_ms"] is not None
+        )
+        completed = statuses[AutoAssignmentEventStatus.SUCCESS] + statuses[AutoAssignmentEventStatus.FAILED]
+
+        self.stdout.write("")
+        self._line("Registered patients", f"{len(patient_ids)} in {registration_time:.2f}s")
+        self._line("Registration errors", sum(registration_errors.values()))
+        for error, count in registration_errors.most_common(5):
+            self.stdout.write(f"  {count}x {error}")
+        self._line("Succeeded", statuses[AutoAssignmentEventStatus.SUCCESS])
+        self._line("Failed", statuses[AutoAssignmentEventStatus.FAILED])
+        for reason, count in failure_reasons.most_common(5):
+            self.stdout.write(f"  {count}x {reason}")
+        self._line("Pending / missing", len(patient_ids) - completed)
+        self._line("Lock failures", lock_failures)
+        self._line("Throughput", f"{completed / total_time * 60:.1f} assignments/min")
+        for rank in PERCENTILES:
+            value = percentile(execution_times, rank)
+            self._line(f"Latency p{rank}", f"{value} ms" if value is not None else "-")
+        self._line("Latency max", f"{execution_times[-1]} ms" if execution_times else "-")
+        if query_count is None:
+            self._line("DB queries", "n/a (assignments ran on the workers)")
+        else:
+            per_patient = query_count / len(patient_ids) if patient_ids else 0
+            self._line("DB queries", f"{query_count} ({per_patient:.1f} per patient)")
+
+    def _line(self, label, value):
+        self.stdout.write(f"{label + ':':<25}{value}")
+
+    def _cleanup(self, run_id):
+        """
+        Hard-deletes the run's patients along with their appointments and
+        assignment events, releasing the slot capacity the appointments took.
+        """
+        patient_ids = list(
+            Patient.objects.filter(name__startswith=load_test_patient_name_prefix(run_id)).values_list(
+                "id", flat=True
+            )
+        )
+
+        with transaction.atomic():
+            bookings = TokenBooking.objects.filter(patient_id__in=patient_ids)
+            booked_slots = Counter(bookings.values_list("token_slot_id", flat=True))
+            for slot_id, booking_count in booked_slots.items():
+                TokenSlot.objects.filter(id=slot_id).update(allocated=F("allocated") - booking_count)
+            bookings.delete()
+            AutoAssignmentEvent.objects.filter(patient_id__in=patient_ids).delete()
+            Patient.objects.filter(id__in=patient_ids).delete()
+
+        self.stdout.write(
+            f"Removed {len(patient_ids)} patients and {sum(booked_slots.values())} appointments of load test {run_id}"
+        )
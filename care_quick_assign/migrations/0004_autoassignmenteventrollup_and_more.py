@@ -0,0 +1,45 @@
+# Generated by Django 6.0 on 2026-10-19 09:12
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('care_quick_assign', '0003_autoassignmentconfig_window_size_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AutoAssignmentEventRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('external_id', models.UUIDField(db_index=True, default=uuid.uuid4, unique=True)),
+                ('created_date', models.DateTimeField(auto_now_add=True, db_index=True, null=True)),
+                ('modified_date', models.DateTimeField(auto_now=True, db_index=True, null=True)),
+                ('deleted', models.BooleanField(db_index=True, default=False)),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('SUCCESS', 'Success'), ('FAILED', 'Failed')], max_length=20)),
+                ('event_count', models.PositiveIntegerField(default=0)),
+                ('total_execution_time_ms', models.PositiveBigIntegerField(default=0)),
+                ('max_execution_time_ms', models.PositiveIntegerField(default=0)),
+                ('total_retry_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'status'), name='unique_auto_assignment_rollup_per_day_status')],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='autoassignmentevent',
+            name='care_quick__status_9c5cd8_idx',
+        ),
+        migrations.AddIndex(
+            model_name='autoassignmentevent',
+            index=models.Index(condition=models.Q(('status__in', ['PENDING', 'FAILED'])), fields=['status'], name='auto_assign_event_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='autoassignmentevent',
+            index=models.Index(fields=['completed_at'], name='auto_assign_event_done_idx'),
+        ),
+    ]
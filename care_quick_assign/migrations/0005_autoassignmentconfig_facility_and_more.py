@@ -0,0 +1,24 @@
+# Generated by Django 6.0 on 2026-10-19 11:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('care_quick_assign', '0004_autoassignmenteventrollup_and_more'),
+        ('facility', '__first__'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='autoassignmentconfig',
+            name='facility',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='facility.facility'),
+        ),
+        migrations.AddConstraint(
+            model_name='autoassignmentconfig',
+            constraint=models.UniqueConstraint(fields=('facility',), name='unique_auto_assignment_config_per_facility'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-19 14:05
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('care_quick_assign', '0005_autoassignmentconfig_facility_and_more'),
+        ('emr', '0075_chargeitem_discount_configuration_and_more'),
+        ('facility', '__first__'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssignmentProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('external_id', models.UUIDField(db_index=True, default=uuid.uuid4, unique=True)),
+                ('created_date', models.DateTimeField(auto_now_add=True, db_index=True, null=True)),
+                ('modified_date', models.DateTimeField(auto_now=True, db_index=True, null=True)),
+                ('deleted', models.BooleanField(db_index=True, default=False)),
+                ('duration_ms', models.PositiveIntegerField()),
+                ('stats', models.BinaryField()),
+                ('facility', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='facility.facility')),
+                ('patient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='emr.patient')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-19 16:20
+
+from django.db import migrations, models
+
+
+def delete_unsuccessful_rollups(apps, schema_editor):
+    # Rollups only cover successful events; rows of other statuses would
+    # collide with them once the status column is gone.
+    AutoAssignmentEventRollup = apps.get_model('care_quick_assign', 'AutoAssignmentEventRollup')
+    AutoAssignmentEventRollup.objects.exclude(status='SUCCESS').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('care_quick_assign', '0006_assignmentprofile'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_unsuccessful_rollups, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='autoassignmenteventrollup',
+            name='unique_auto_assignment_rollup_per_day_status',
+        ),
+        migrations.RemoveField(
+            model_name='autoassignmenteventrollup',
+            name='status',
+        ),
+        migrations.AddConstraint(
+            model_name='autoassignmenteventrollup',
+            constraint=models.UniqueConstraint(fields=('day',), name='unique_auto_assignment_rollup_per_day'),
+        ),
+    ]
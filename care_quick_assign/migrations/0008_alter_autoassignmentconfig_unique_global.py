@@ -0,0 +1,32 @@
+# Generated by Django 6.0 on 2026-10-19 16:45
+
+from django.db import migrations, models
+
+
+def delete_duplicate_global_configs(apps, schema_editor):
+    # The oldest global config is the one assignments resolved to; any other
+    # would violate the constraint.
+    AutoAssignmentConfig = apps.get_model('care_quick_assign', 'AutoAssignmentConfig')
+    global_configs = AutoAssignmentConfig.objects.filter(facility__isnull=True).order_by('id')
+    first_global_config = global_configs.first()
+    if first_global_config is not None:
+        global_configs.exclude(id=first_global_config.id).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('care_quick_assign', '0007_remove_autoassignmenteventrollup_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_global_configs, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='autoassignmentconfig',
+            name='unique_auto_assignment_config_per_facility',
+        ),
+        migrations.AddConstraint(
+            model_name='autoassignmentconfig',
+            constraint=models.UniqueConstraint(fields=('facility',), name='unique_auto_assignment_config_per_facility', nulls_distinct=False),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import models
+
+from care.utils.models.base import BaseModel
+from care.emr.models.patient import Patient
+from care.facility.models.facility import Facility
+
+
+class AssignmentProfile(BaseModel):
+    """
+    A compressed cProfile capture of one run of the assignment task.
+    """
+
+    patient = models.ForeignKey(Patient, on_delete=models.CASCADE)
+    facility = models.ForeignKey(
+        Facility,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
+    duration_ms = models.PositiveIntegerField()
+    # zlib compressed, marshalled pstats data, i.e. a compressed .prof file
+    stats = models.BinaryField()
+
+    def __str__(self):
+        return f"Assignment profile for patient {self.patient_id} ({self.duration_ms} ms)"
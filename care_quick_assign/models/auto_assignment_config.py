@@ -1,10 +1,19 @@
 from django.db import models
 from django.core.validators import MinValueValidator
 
+from care.facility.models.facility import Facility
 from care.utils.models.base import BaseModel
 
 
 class AutoAssignmentConfig(BaseModel):
+    # Configs without a facility are the global default, used by facilities
+    # that don't have a config of their own.
+    facility = models.ForeignKey(
+        Facility,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True
+    )
     enabled = models.BooleanField(default=False)
     max_patients_per_staff = models.PositiveIntegerField(
         validators=[MinValueValidator(1)]
@@ -18,4 +27,17 @@ class AutoAssignmentConfig(BaseModel):
 
     def __str__(self):
         state = "enabled" if self.enabled else "disabled"
-        return f"AutoAssignmentConfig ({state})"
+        scope = f"facility {self.facility_id}" if self.facility_id else "global"
+        return f"AutoAssignmentConfig ({scope}, {state})"
+
+
+    class Meta:
+        constraints = [
+            # NULLs are not distinct here, so there is a single global config
+            # as well.
+            models.UniqueConstraint(
+                fields=["facility"],
+                name="unique_auto_assignment_config_per_facility",
+                nulls_distinct=False,
+            )
+        ]
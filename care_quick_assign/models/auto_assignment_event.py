@@ -1,12 +1,17 @@
 from rest_framework.exceptions import ValidationError
 
-from django.db import models
+from django.db import models, transaction
 
 from care.utils.models.base import BaseModel
 from care.utils.time_util import care_now
 from care.emr.models.patient import Patient
 from care.users.models import User
 
+from care_quick_assign.notifications import (
+    clear_assignment_finalized,
+    notify_assignment_finalized,
+)
+
 
 class AutoAssignmentEventStatus(models.TextChoices):
     PENDING = "PENDING"
@@ -68,7 +73,16 @@ class AutoAssignmentEvent(BaseModel):
             models.UniqueConstraint(fields=["patient"], name="unique_auto_assignment_per_patient")
         ]
         indexes = [
-            models.Index(fields=["status"]),
+            # Only open events are looked up by status; finalized history is
+            # kept out of the index so it stays small as events accumulate.
+            models.Index(
+                fields=["status"],
+                condition=models.Q(
+                    status__in=[AutoAssignmentEventStatus.PENDING, AutoAssignmentEventStatus.FAILED]
+                ),
+                name="auto_assign_event_open_idx",
+            ),
+            models.Index(fields=["completed_at"], name="auto_assign_event_done_idx"),
         ]
 
 
@@ -83,6 +97,9 @@ class AutoAssignmentEvent(BaseModel):
         self.execution_time_ms = int((now - self.triggered_at).total_seconds() * 1000)
         self.completed_at = now
         self.save()
+        transaction.on_commit(
+            lambda: notify_assignment_finalized(self.id, self.status)
+        )
 
 
     def reinitialize_for_retry(self):
@@ -96,6 +113,7 @@ class AutoAssignmentEvent(BaseModel):
         self.triggered_at = care_now()
         self.retry_count += 1
         self.save()
+        clear_assignment_finalized(self.id)
 
 
     def log_failure(self, reason):
@@ -0,0 +1,25 @@
+from django.db import models
+
+from care.utils.models.base import BaseModel
+
+
+class AutoAssignmentEventRollup(BaseModel):
+    """
+    Daily aggregates of successful auto-assignment events, kept after the
+    events themselves are purged by the retention job.
+    """
+
+    day = models.DateField()
+    event_count = models.PositiveIntegerField(default=0)
+    total_execution_time_ms = models.PositiveBigIntegerField(default=0)
+    max_execution_time_ms = models.PositiveIntegerField(default=0)
+    total_retry_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Auto-Assignment Rollup for {self.day}"
+
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["day"], name="unique_auto_assignment_rollup_per_day")
+        ]
@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import defaultdict
+
+from django.core.cache import cache
+
+from care_quick_assign.settings import plugin_settings
+
+
+_waiters = defaultdict(set)
+_waiters_lock = threading.Lock()
+
+
+def _finalized_cache_key(event_id):
+    return f"care_quick_assign:event_finalized:{event_id}"
+
+
+def notify_assignment_finalized(event_id, status):
+    """
+    Publishes the final status of an assignment event.
+
+    Waiters in the current process are woken immediately; waiters in other
+    processes (the API workers, when the task ran on a celery worker) pick
+    the status up from the shared cache.
+    """
+    cache.set(
+        _finalized_cache_key(event_id),
+        status,
+        timeout=plugin_settings.ASSIGNMENT_STATUS_NOTIFY_TTL,
+    )
+    with _waiters_lock:
+        waiters = _waiters.pop(event_id, set())
+    for waiter in waiters:
+        waiter.set()
+
+
+def clear_assignment_finalized(event_id):
+    cache.delete(_finalized_cache_key(event_id))
+
+
+def wait_for_assignment_finalized(event_id, timeout):
+    """
+    Blocks until the event is finalized or the timeout elapses.
+
+    Returns True if a finalization was observed, False on timeout.
+    """
+    key = _finalized_cache_key(event_id)
+    waiter = threading.Event()
+    with _waiters_lock:
+        _waiters[event_id].add(waiter)
+
+    try:
+        deadline = time.monotonic() + timeout
+        poll_interval = plugin_settings.ASSIGNMENT_STATUS_CACHE_POLL_INTERVAL
+        while True:
+            if cache.get(key) is not None:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if waiter.wait(min(remaining, poll_interval)):
+                return True
+    finally:
+        with _waiters_lock:
+            event_waiters = _waiters.get(event_id)
+            if event_waiters is not None:
+                event_waiters.discard(waiter)
+                if not event_waiters:
+                    _waiters.pop(event_id, None)
@@ -0,0 +1,23 @@
+from celery import current_app
+
+from care_quick_assign.settings import plugin_settings
+from care_quick_assign.tasks import purge_assignment_events, refresh_slot_horizon
+
+
+def register_periodic_tasks():
+    if plugin_settings.SLOT_HORIZON_REFRESH_INTERVAL:
+        current_app.add_periodic_task(
+            plugin_settings.SLOT_HORIZON_REFRESH_INTERVAL,
+            refresh_slot_horizon.s(),
+            name="care_quick_assign.refresh_slot_horizon",
+        )
+
+    retention_enabled = (
+        plugin_settings.ASSIGNMENT_EVENT_RETENTION_DAYS or plugin_settings.PROFILING_RETENTION_DAYS
+    )
+    if retention_enabled and plugin_settings.ASSIGNMENT_EVENT_PURGE_INTERVAL:
+        current_app.add_periodic_task(
+            plugin_settings.ASSIGNMENT_EVENT_PURGE_INTERVAL,
+            purge_assignment_events.s(),
+            name="care_quick_assign.purge_assignment_events",
+        )
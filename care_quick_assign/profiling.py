@@ -0,0 +1,103 @@
+import cProfile
+import io
+import logging
+import marshal
+import pstats
+import random
+import time
+import zlib
+from contextlib import contextmanager
+
+from care_quick_assign.models.assignment_profile import AssignmentProfile
+from care_quick_assign.settings import plugin_settings
+
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SORT_KEYS = set(pstats.Stats.sort_arg_dict_default)
+
+
+def should_profile(facility):
+    """
+    Decides whether a run of the assignment task is profiled: always for the
+    facilities listed in PROFILING_FACILITIES, otherwise for a
+    PROFILING_SAMPLE_RATE fraction of runs.
+    """
+    if facility is not None and str(facility.external_id) in plugin_settings.PROFILING_FACILITIES:
+        return True
+    sample_rate = plugin_settings.PROFILING_SAMPLE_RATE
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+@contextmanager
+def profile_assignment(patient, facility):
+    """
+    Profiles the block with cProfile when `should_profile` selects it and
+    stores the compressed result as an AssignmentProfile.
+    """
+    if not should_profile(facility):
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except Exception:
+        # Only one profiler can be active at a time (enforced since Python
+        # 3.12); the run goes ahead unprofiled rather than failing.
+        logger.warning(
+            "Could not profile the assignment of patient %s, running it unprofiled",
+            patient.id,
+            exc_info=True,
+        )
+        profiler = None
+
+    if profiler is None:
+        yield
+        return
+
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        duration_ms = int((time.perf_counter() - started_at) * 1000)
+        try:
+            profiler.create_stats()
+            AssignmentProfile.objects.create(
+                patient=patient,
+                facility=facility,
+                duration_ms=duration_ms,
+                stats=zlib.compress(marshal.dumps(profiler.stats)),
+            )
+        except Exception:
+            logger.exception("Failed to store assignment profile for patient %s", patient.id)
+
+
+class _StoredStats:
+    # pstats.Stats loads anything exposing create_stats() and stats
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+def load_profile_stats(profile, stream=None):
+    return pstats.Stats(
+        _StoredStats(marshal.loads(zlib.decompress(profile.stats))), stream=stream
+    )
+
+
+def dump_profile(profile):
+    """
+    Returns the profile in the .prof format written by cProfile, readable by
+    pstats, snakeviz and similar tools.
+    """
+    return zlib.decompress(profile.stats)
+
+
+def format_profile(profile, sort="cumulative", limit=30):
+    stream = io.StringIO()
+    load_profile_stats(profile, stream=stream).sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
@@ -0,0 +1,182 @@
+import gzip
+import json
+import logging
+import os
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from care.utils.time_util import care_now
+
+from care_quick_assign.models.assignment_profile import AssignmentProfile
+from care_quick_assign.models.auto_assignment_event import AutoAssignmentEvent, AutoAssignmentEventStatus
+from care_quick_assign.models.auto_assignment_event_rollup import AutoAssignmentEventRollup
+
+
+logger = logging.getLogger(__name__)
+
+
+ARCHIVED_FIELDS = [
+    "id",
+    "external_id",
+    "patient_id",
+    "status",
+    "failure_reason",
+    "assigned_staff_id",
+    "execution_time_ms",
+    "retry_count",
+    "triggered_at",
+    "completed_at",
+]
+
+
+PARTIAL_SUFFIX = ".partial"
+
+
+def purge_successful_events(retention_days, batch_size, archive_dir=None, dry_run=False):
+    """
+    Compacts successful events completed more than `retention_days` ago into
+    daily rollups, archives them as gzipped NDJSON under `archive_dir` (when
+    given) and deletes them in batches of `batch_size`.
+
+    Failed events are kept regardless of age: they make up the `unassigned`
+    worklist and are needed to retry the assignment.
+
+    Returns the number of purged events (or the number that would be purged
+    when `dry_run` is set).
+    """
+    if retention_days < 1:
+        raise ValueError("Retention period must be at least one day.")
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least one.")
+
+    cutoff = care_now() - timedelta(days=retention_days)
+    expired_events = AutoAssignmentEvent.objects.filter(
+        status=AutoAssignmentEventStatus.SUCCESS,
+        completed_at__lt=cutoff,
+    )
+
+    if dry_run:
+        return expired_events.count()
+
+    if archive_dir:
+        os.makedirs(archive_dir, exist_ok=True)
+        _recover_partial_archives(archive_dir)
+
+    purged = 0
+    while True:
+        archive_path = None
+        try:
+            with transaction.atomic():
+                batch = list(
+                    expired_events.order_by("id").values(*ARCHIVED_FIELDS)[:batch_size]
+                )
+                if not batch:
+                    break
+
+                if archive_dir:
+                    archive_path = _write_partial_archive(archive_dir, batch)
+                    transaction.on_commit(
+                        lambda path=archive_path: os.replace(path, path[: -len(PARTIAL_SUFFIX)])
+                    )
+                _rollup_batch(batch)
+                AutoAssignmentEvent.objects.filter(id__in=[event["id"] for event in batch]).delete()
+        except Exception:
+            # The batch was rolled back and stays in the table, so its archive
+            # must not survive either.
+            if archive_path and os.path.exists(archive_path):
+                os.remove(archive_path)
+            raise
+
+        purged += len(batch)
+        logger.info(f"Purged {purged} auto-assignment events completed before {cutoff}")
+
+    return purged
+
+
+def purge_assignment_profiles(retention_days, batch_size):
+    """
+    Deletes AssignmentProfile rows created more than `retention_days` ago in
+    batches of `batch_size`. Returns the number of deleted profiles.
+    """
+    if retention_days < 1:
+        raise ValueError("Retention period must be at least one day.")
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least one.")
+
+    cutoff = care_now() - timedelta(days=retention_days)
+    expired_profiles = AssignmentProfile._base_manager.filter(created_date__lt=cutoff)
+
+    purged = 0
+    while True:
+        profile_ids = list(expired_profiles.order_by("id").values_list("id", flat=True)[:batch_size])
+        if not profile_ids:
+            break
+        AssignmentProfile._base_manager.filter(id__in=profile_ids).delete()
+        purged += len(profile_ids)
+
+    if purged:
+        logger.info(f"Purged {purged} assignment profiles created before {cutoff}")
+    return purged
+
+
+def _write_partial_archive(archive_dir, batch):
+    """
+    Writes a batch to its own archive, named after the batch's id range.
+
+    The archive carries a partial suffix until the batch's delete commits;
+    `_recover_partial_archives` settles archives left partial by a crash.
+    """
+    path = os.path.join(
+        archive_dir,
+        f"auto_assignment_events_{batch[0]['id']:012d}-{batch[-1]['id']:012d}.ndjson.gz{PARTIAL_SUFFIX}",
+    )
+    with open(path, "wb") as raw_archive:
+        with gzip.GzipFile(fileobj=raw_archive, mode="wb") as archive:
+            for event in batch:
+                archive.write((json.dumps(event, cls=DjangoJSONEncoder) + "\n").encode())
+        raw_archive.flush()
+        os.fsync(raw_archive.fileno())
+    return path
+
+
+def _recover_partial_archives(archive_dir):
+    """
+    Completes archives whose batch was deleted before the process stopped,
+    and drops those whose batch is still in the table and will be archived
+    again.
+    """
+    for filename in os.listdir(archive_dir):
+        if not filename.endswith(PARTIAL_SUFFIX):
+            continue
+        path = os.path.join(archive_dir, filename)
+        with gzip.open(path, "rt", encoding="utf-8") as archive:
+            event_ids = [json.loads(line)["id"] for line in archive if line.strip()]
+        if AutoAssignmentEvent.objects.filter(id__in=event_ids).exists():
+            os.remove(path)
+        else:
+            os.replace(path, path[: -len(PARTIAL_SUFFIX)])
+
+
+
+def _rollup_batch(batch):
+    totals = defaultdict(lambda: {"count": 0, "execution_time": 0, "max_execution_time": 0, "retries": 0})
+    for event in batch:
+        day = timezone.localtime(event["completed_at"]).date()
+        execution_time_ms = event["execution_time_ms"] or 0
+        total = totals[day]
+        total["count"] += 1
+        total["execution_time"] += execution_time_ms
+        total["max_execution_time"] = max(total["max_execution_time"], execution_time_ms)
+        total["retries"] += event["retry_count"]
+
+    for day, total in totals.items():
+        rollup, _ = AutoAssignmentEventRollup.objects.select_for_update().get_or_create(day=day)
+        rollup.event_count += total["count"]
+        rollup.total_execution_time_ms += total["execution_time"]
+        rollup.max_execution_time_ms = max(rollup.max_execution_time_ms, total["max_execution_time"])
+        rollup.total_retry_count += total["retries"]
+        rollup.save()
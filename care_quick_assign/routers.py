@@ -0,0 +1,69 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections, DEFAULT_DB_ALIAS
+
+from care_quick_assign.settings import plugin_settings
+
+
+_replica_reads = ContextVar("care_quick_assign_replica_reads", default=False)
+
+
+def get_read_database():
+    """
+    Returns the alias read-only planner queries should use: the configured
+    READ_REPLICA_DATABASE when it exists, the primary otherwise.
+    """
+    alias = plugin_settings.READ_REPLICA_DATABASE
+    if alias and alias in connections.databases:
+        return alias
+    return DEFAULT_DB_ALIAS
+
+
+def uses_read_replica():
+    return get_read_database() != DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def replica_reads():
+    """
+    Routes the reads evaluated inside the block to the read replica, when
+    ReplicaRouter is installed and a replica is configured.
+    """
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Database router sending reads made inside `replica_reads()` to the
+    configured READ_REPLICA_DATABASE. Writes and all other reads are left to
+    the remaining routers (the primary, by default).
+
+    Enable it by adding "care_quick_assign.routers.ReplicaRouter" to the
+    DATABASE_ROUTERS setting.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and uses_read_replica():
+            return get_read_database()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica mirrors the primary, so objects read from either may be
+        # related to each other.
+        databases = {DEFAULT_DB_ALIAS, get_read_database()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if uses_read_replica() and db == get_read_database():
+            return False
+        return None
@@ -100,7 +100,61 @@ class PluginSettings:  # pragma: no cover
 
 REQUIRED_SETTINGS = {}
 
-DEFAULTS = {}
+DEFAULTS = {
+    # Longest time (in seconds) the status endpoint holds a request open
+    # while waiting for a pending assignment to finish.
+    "ASSIGNMENT_STATUS_MAX_WAIT": 25,
+    # How often (in seconds) a waiting request re-checks the shared cache
+    # for finalizations published by other processes.
+    "ASSIGNMENT_STATUS_CACHE_POLL_INTERVAL": 0.5,
+    # How long (in seconds) a finalization notice is kept in the cache.
+    "ASSIGNMENT_STATUS_NOTIFY_TTL": 300,
+    # Interval (in seconds) of the periodic task keeping TokenSlots
+    # pre-generated over the assignment window. 0 disables the task and
+    # slots are materialized lazily while assigning.
+    "SLOT_HORIZON_REFRESH_INTERVAL": 900,
+    # Successful assignment events older than this many days are compacted
+    # into daily rollups and purged. Failed events are kept for retries.
+    # 0 (the default) disables the retention task.
+    "ASSIGNMENT_EVENT_RETENTION_DAYS": 0,
+    # Interval (in seconds) of the retention task.
+    "ASSIGNMENT_EVENT_PURGE_INTERVAL": 86400,
+    # Number of events archived and deleted per transaction.
+    "ASSIGNMENT_EVENT_PURGE_BATCH_SIZE": 1000,
+    # Directory receiving gzipped NDJSON archives of purged events. Events
+    # are purged without an archive when left empty.
+    "ASSIGNMENT_EVENT_ARCHIVE_DIR": "",
+    # Counts the queries of each stage of the assignment task and reports
+    # stages exceeding their QUERY_BUDGETS entry.
+    "QUERY_BUDGET_ENABLED": True,
+    # Raise QueryBudgetExceeded instead of logging a warning when a stage
+    # exceeds its budget. Meant for test runs.
+    "QUERY_BUDGET_STRICT": False,
+    # Maximum number of queries per stage. Stages without an entry are
+    # counted but not limited.
+    "QUERY_BUDGETS": {
+        "load_patient": 1,
+        "resolve_facility": 1,
+        "create_event": 4,
+        "plan_slot": 3,
+        "plan_day": 2,
+        "book_appointment": 10,
+        "log_result": 2,
+    },
+    # Alias of a read replica in DATABASES. The slot planner's schedule reads
+    # and, with care_quick_assign.routers.ReplicaRouter installed, the
+    # unassigned listing are served from it. Empty keeps all reads on the
+    # primary.
+    "READ_REPLICA_DATABASE": "",
+    # External ids of the facilities whose assignment tasks are always
+    # profiled with cProfile.
+    "PROFILING_FACILITIES": [],
+    # Fraction (0 to 1) of all other assignment tasks that are profiled.
+    "PROFILING_SAMPLE_RATE": 0.0,
+    # Number of days stored profiles are kept for; they are deleted by the
+    # retention task. 0 keeps them indefinitely.
+    "PROFILING_RETENTION_DAYS": 14,
+}
 
 plugin_settings = PluginSettings(
     PLUGIN_NAME, defaults=DEFAULTS, required_settings=REQUIRED_SETTINGS
@@ -1,12 +1,14 @@
 from django.db import transaction
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from django.forms.models import model_to_dict
 
+from care.emr.models import AvailabilityException
 from care.emr.models.patient import Patient
+from care.emr.models.scheduling.schedule import Availability, Schedule
 
+from care_quick_assign.config_resolver import has_enabled_assignment_config, invalidate_assignment_configs
 from care_quick_assign.models.auto_assignment_config import AutoAssignmentConfig
-from care_quick_assign.tasks import create_quick_assignment
+from care_quick_assign.tasks import create_quick_assignment, invalidate_slot_horizon
 
 import logging
 
@@ -18,19 +20,42 @@ def hook_patient_created(sender, instance, created, **kwargs):
     if not created:
         return
 
-    auto_assignment_config = AutoAssignmentConfig.objects.first()
-
-    if not auto_assignment_config:
-        logger.info("Auto-assignment config is missing")
-        return
-
-    if not auto_assignment_config.enabled:
+    # The config applying to the patient's facility is resolved by the task;
+    # this only skips patients when no config is enabled at all.
+    if not has_enabled_assignment_config():
         logger.info("Quick auto-assignment feature is disabled")
         return
 
-    config_snapshot = model_to_dict(auto_assignment_config, exclude=["enabled"])
-    logger.info(config_snapshot)
-
     transaction.on_commit(
-        lambda: create_quick_assignment.delay(instance.external_id, config_snapshot)
+        lambda: create_quick_assignment.delay(instance.external_id, None)
     )
+
+
+@receiver(post_save, sender=AutoAssignmentConfig)
+@receiver(post_delete, sender=AutoAssignmentConfig)
+def hook_assignment_config_changed(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_assignment_configs)
+
+
+@receiver(post_save, sender=Schedule)
+@receiver(post_delete, sender=Schedule)
+@receiver(post_save, sender=AvailabilityException)
+@receiver(post_delete, sender=AvailabilityException)
+def hook_schedule_changed(sender, instance, **kwargs):
+    resource_id = instance.resource_id
+    transaction.on_commit(lambda: invalidate_slot_horizon(resource_id))
+
+
+@receiver(post_save, sender=Availability)
+@receiver(post_delete, sender=Availability)
+def hook_availability_changed(sender, instance, **kwargs):
+    schedule_id = instance.schedule_id
+
+    def invalidate():
+        resource_id = Schedule._base_manager.filter(id=schedule_id).values_list(
+            "resource_id", flat=True
+        ).first()
+        if resource_id is not None:
+            invalidate_slot_horizon(resource_id)
+
+    transaction.on_commit(invalidate)
@@ -0,0 +1,89 @@
+"""
+Slot arithmetic on integer seconds since midnight.
+
+Availability windows, exceptions and slots are handled as plain integers so
+generating a day's slots doesn't allocate datetimes per iteration; callers
+convert to timezone aware datetimes once, when slots are persisted.
+"""
+
+from datetime import time
+from functools import lru_cache
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def time_to_seconds(value):
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def seconds_to_time(seconds):
+    seconds %= SECONDS_PER_DAY
+    return time(seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+
+@lru_cache(maxsize=1024)
+def parse_availability_window(start_time, end_time):
+    """
+    Parses the ISO formatted bounds of an availability entry into seconds
+    since midnight. Schedules repeat the same few windows on every day, so
+    the parsed values are cached.
+    """
+    return (
+        time_to_seconds(time.fromisoformat(start_time)),
+        time_to_seconds(time.fromisoformat(end_time)),
+    )
+
+
+def generate_slots(start, end, slot_size_in_minutes, exception_windows, max_slots):
+    """
+    Yields the (start, end) seconds of the slots between `start` and `end`
+    that don't overlap any of the (start, end) `exception_windows`.
+
+    Slot ends are not wrapped, so the last slot of a window may end past
+    midnight.
+    """
+    step = slot_size_in_minutes * 60
+    current = start
+    for _ in range(max_slots):
+        if current >= end:
+            break
+        slot_end = current + step
+        for exception_start, exception_end in exception_windows:
+            if exception_start < slot_end and exception_end > current:
+                break
+        else:
+            yield current, slot_end
+        current = slot_end
+
+
+def build_slots(availabilities, exception_windows, max_slots):
+    """
+    Generates the slots of a day from its availabilities.
+
+    Each availability is a dict holding the `start_time` and `end_time`
+    strings of the window, `slot_size_in_minutes`, `availability_id` and
+    `resource_id`. Returns a dict keyed by the (start, end) seconds of each
+    slot, with the end wrapped to the day, holding the slot's `start`, `end`,
+    `availability_id` and `resource_id`. Slots produced by a later availability
+    replace identical slots of an earlier one.
+    """
+    slots = {}
+    for availability in availabilities:
+        start, end = parse_availability_window(
+            availability["start_time"], availability["end_time"]
+        )
+        for slot_start, slot_end in generate_slots(
+            start,
+            end,
+            availability["slot_size_in_minutes"],
+            exception_windows,
+            max_slots,
+        ):
+            slot_end %= SECONDS_PER_DAY
+            slots[(slot_start, slot_end)] = {
+                "start": slot_start,
+                "end": slot_end,
+                "availability_id": availability["availability_id"],
+                "resource_id": availability["resource_id"],
+            }
+    return slots
@@ -1,17 +1,26 @@
+import hashlib
 import logging
-from datetime import datetime, time, timedelta
+import uuid
+from datetime import datetime
 
 from celery import shared_task
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import DEFAULT_DB_ALIAS, transaction
 from django.db.models import F
 from django.utils import timezone
 
+from care_quick_assign.instrumentation import enforce_query_budgets, query_budget
+from care_quick_assign.profiling import profile_assignment
+from care_quick_assign.routers import get_read_database, uses_read_replica
 from care_quick_assign.settings import plugin_settings
+from care_quick_assign.slot_engine import build_slots, seconds_to_time, time_to_seconds
 
+from care_quick_assign.config_resolver import has_enabled_assignment_config, resolve_assignment_config
 from care_quick_assign.models.auto_assignment_event import AutoAssignmentEvent
+from care_quick_assign.retention import purge_assignment_profiles, purge_successful_events
 
 from care.emr.api.viewsets.scheduling import lock_create_appointment
 
@@ -39,42 +48,81 @@ logger = logging.getLogger(__name__)
 
 
 @shared_task
-def create_quick_assignment(patient_external_id, assignment_config):
-    patient = Patient.objects.filter(external_id=patient_external_id).first()
+def create_quick_assignment(patient_external_id, assignment_config=None):
+    """
+    Books the first available slot for a patient.
+
+    Without an `assignment_config` snapshot, the config of the patient's
+    facility (or the global default) is resolved and the assignment is
+    skipped when it is disabled.
+    """
+    with enforce_query_budgets():
+        _create_quick_assignment(patient_external_id, assignment_config)
+
+
+
+def _create_quick_assignment(patient_external_id, assignment_config):
+    with query_budget("load_patient"):
+        patient = Patient.objects.filter(external_id=patient_external_id).first()
 
     if not patient:
         logger.warning("Patient with external_id %s not found.", patient_external_id)
         return
 
-    assignment_event_log, _ = AutoAssignmentEvent.objects.get_or_create(patient=patient)
-
-    try:
+    with query_budget("resolve_facility"):
         facility = Facility.objects.filter(geo_organization=patient.geo_organization).first()
 
+    if assignment_config is None:
+        enabled, assignment_config = resolve_assignment_config(facility.id if facility else None)
+        if not enabled:
+            logger.info("Quick auto-assignment is disabled for patient %s", patient_external_id)
+            return
+
+    with profile_assignment(patient, facility):
+        assign_patient(
+            patient=patient,
+            facility=facility,
+            assignment_config=assignment_config,
+        )
+
+
+
+def assign_patient(patient, facility, assignment_config):
+    with query_budget("create_event"):
+        assignment_event_log, _ = AutoAssignmentEvent.objects.get_or_create(patient=patient)
+
+    try:
         if not facility:
             assignment_event_log.log_failure("No facility found for patient assignment")
             return
 
-        first_best_slot = get_first_best_slot_handler(
-            facility = facility,
-            window_size = assignment_config["window_size"]
-        )
+        with query_budget("plan_slot"):
+            first_best_slot = get_first_best_slot_handler(
+                facility = facility,
+                window_size = assignment_config["window_size"]
+            )
 
         if not first_best_slot:
-            day_count = f"{assignment_config["window_size"]} day{'s' if assignment_config["window_size"] != 1 else ''}"
+            window_size = assignment_config["window_size"]
+            day_count = f"{window_size} day{'s' if window_size != 1 else ''}"
             assignment_event_log.log_failure(
                 f"No suitable slot found within {day_count} for quick assignment"
             )
             return
 
-        appointment = create_appointment_handler(
-            slot=first_best_slot,
-            patient=patient,
-            user=patient.created_by
-        )
+        with query_budget("book_appointment"):
+            if uses_read_replica():
+                revalidate_slot_on_primary(first_best_slot)
+
+            appointment = create_appointment_handler(
+                slot=first_best_slot,
+                patient=patient,
+                user=patient.created_by,
+            )
 
-        assigned_staff = appointment.token_slot.resource.user
-        assignment_event_log.log_success(assigned_staff=assigned_staff)
+        with query_budget("log_result"):
+            assigned_staff = appointment.token_slot.resource.user
+            assignment_event_log.log_success(assigned_staff=assigned_staff)
 
 
     except Exception as e:
@@ -83,37 +131,48 @@ def create_quick_assignment(patient_external_id, assignment_config):
 
 
 def get_first_best_slot_handler(facility, window_size):
-    schedulable_resources = SchedulableResource.objects.filter(
-        facility=facility,
-        resource_type=SchedulableResourceTypeOptions.practitioner.value,
+    # Schedule reads for planning may be served by a read replica; slots are
+    # materialized from primary reads and read on the primary, which is why
+    # resources are passed on as ids rather than as a subquery.
+    read_database = get_read_database()
+
+    schedulable_resources = list(
+        SchedulableResource.objects.using(read_database).filter(
+            facility=facility,
+            resource_type=SchedulableResourceTypeOptions.practitioner.value,
+        ).values_list("id", flat=True)
     )
 
-    if not schedulable_resources.exists():
+    if not schedulable_resources:
         raise Exception("No practitioners found in the facilities")
 
     if not window_size or window_size < 1:
         raise ValidationError("Invalid window size for auto-assignment")
 
-    current_timestamp = timezone.now()
-    start_date = current_timestamp.date()
+    start_date = timezone.localdate()
     end_date = start_date + timezone.timedelta(days=window_size)
 
-    availabilities = Availability.objects.filter(
+    availabilities = Availability.objects.using(read_database).filter(
         slot_type=SlotTypeOptions.appointment.value,
         schedule__valid_from__lte=end_date,
         schedule__valid_to__gte=start_date,
         schedule__resource__in=schedulable_resources,
-    )
+    ).select_related("schedule")
 
-    if not availabilities:
+    if not availabilities.exists():
         raise Exception(f"No availabilities found for the practitioners within the facilities")
 
-    exceptions = AvailabilityException.objects.filter(
+    exceptions = AvailabilityException.objects.using(read_database).filter(
         resource__in=schedulable_resources,
         valid_from__lte=end_date,
         valid_to__gte=start_date,
     )
 
+    materialized_days = get_materialized_days(
+        facility=facility,
+        days=[start_date + timezone.timedelta(days=day_offset) for day_offset in range(window_size)],
+    )
+
     for day_offset in range(window_size):
         day = start_date + timezone.timedelta(days=day_offset)
 
@@ -127,22 +186,241 @@ def get_first_best_slot_handler(facility, window_size):
             valid_to__gte=day,
         )
 
-        slots_for_current_day = get_slots_for_day_handler(
-            availabilities=availabilities_for_current_day,
-            exceptions=exceptions_for_current_day,
-            schedulable_resources=schedulable_resources,
-            day=day,
-        )
+        with query_budget("plan_day"):
+            slots_for_current_day = get_slots_for_day_handler(
+                availabilities=availabilities_for_current_day,
+                exceptions=exceptions_for_current_day,
+                schedulable_resources=schedulable_resources,
+                day=day,
+                materialize=day not in materialized_days,
+            )
+            first_slot_for_current_day = slots_for_current_day.first()
 
-        if slots_for_current_day.exists():
+        if first_slot_for_current_day:
             logger.info(f"Slots found for day {day}")
-            return slots_for_current_day.first()
+            return first_slot_for_current_day
 
     raise Exception(f"No suitable slot found within {window_size} day{'s' if window_size != 1 else ''} for quick assignment")
 
 
 
-def get_slots_for_day_handler(availabilities, exceptions, schedulable_resources, day):
+@shared_task
+def refresh_slot_horizon():
+    """
+    Keeps TokenSlots pre-generated for every practitioner facility over the
+    configured assignment window, so the assignment path only has to read
+    and book.
+    """
+    if not has_enabled_assignment_config():
+        return
+
+    facility_ids = SchedulableResource.objects.filter(
+        resource_type=SchedulableResourceTypeOptions.practitioner.value,
+    ).values_list("facility_id", flat=True).distinct()
+
+    for facility in Facility.objects.filter(id__in=facility_ids):
+        enabled, assignment_config = resolve_assignment_config(facility.id)
+        if not enabled:
+            continue
+
+        try:
+            refresh_slot_horizon_for_facility(
+                facility=facility,
+                window_size=assignment_config["window_size"]
+            )
+        except Exception:
+            logger.exception("Failed to refresh slot horizon for facility %s", facility.id)
+
+
+
+@shared_task
+def purge_assignment_events():
+    if plugin_settings.ASSIGNMENT_EVENT_RETENTION_DAYS:
+        purge_successful_events(
+            retention_days=plugin_settings.ASSIGNMENT_EVENT_RETENTION_DAYS,
+            batch_size=plugin_settings.ASSIGNMENT_EVENT_PURGE_BATCH_SIZE,
+            archive_dir=plugin_settings.ASSIGNMENT_EVENT_ARCHIVE_DIR,
+        )
+
+    if plugin_settings.PROFILING_RETENTION_DAYS:
+        purge_assignment_profiles(
+            retention_days=plugin_settings.PROFILING_RETENTION_DAYS,
+            batch_size=plugin_settings.ASSIGNMENT_EVENT_PURGE_BATCH_SIZE,
+        )
+
+
+
+def refresh_slot_horizon_for_facility(facility, window_size):
+    """
+    Materializes the slots of each day in the window whose availabilities or
+    exceptions changed since the last run, along with days that newly entered
+    the window. Unchanged days are skipped.
+    """
+    # Read before the schedules, so that a change committed while the run is
+    # in progress moves the facility to a new generation and the fingerprints
+    # written below, computed from the older schedules, are never consulted.
+    generation = _slot_horizon_generation(facility.id)
+
+    schedulable_resources = SchedulableResource.objects.filter(
+        facility=facility,
+        resource_type=SchedulableResourceTypeOptions.practitioner.value,
+    )
+
+    start_date = timezone.localdate()
+    end_date = start_date + timezone.timedelta(days=window_size)
+
+    availabilities = Availability.objects.filter(
+        slot_type=SlotTypeOptions.appointment.value,
+        schedule__valid_from__lte=end_date,
+        schedule__valid_to__gte=start_date,
+        schedule__resource__in=schedulable_resources,
+    ).select_related("schedule")
+
+    exceptions = AvailabilityException.objects.filter(
+        resource__in=schedulable_resources,
+        valid_from__lte=end_date,
+        valid_to__gte=start_date,
+    )
+
+    days = [start_date + timezone.timedelta(days=day_offset) for day_offset in range(window_size)]
+    cache_keys = {day: _slot_horizon_cache_key(facility.id, generation, day) for day in days}
+    known_fingerprints = cache.get_many(cache_keys.values())
+    fingerprints = {}
+
+    for day in days:
+        availabilities_for_current_day = list(
+            availabilities.filter(
+                schedule__valid_from__lte=day,
+                schedule__valid_to__gte=day,
+            )
+        )
+
+        exceptions_for_current_day = list(
+            exceptions.filter(
+                valid_from__lte=day,
+                valid_to__gte=day,
+            )
+        )
+
+        fingerprint = _slot_horizon_fingerprint(
+            availabilities_for_current_day, exceptions_for_current_day
+        )
+
+        if known_fingerprints.get(cache_keys[day]) != fingerprint:
+            materialize_slots_for_day(
+                availabilities=availabilities_for_current_day,
+                exceptions=exceptions_for_current_day,
+                schedulable_resources=schedulable_resources,
+                day=day,
+            )
+            logger.info(f"Materialized slots for facility {facility.id} on {day}")
+
+        fingerprints[cache_keys[day]] = fingerprint
+
+    # Unchanged days are written back as well to keep them from expiring while
+    # the periodic task is running.
+    cache.set_many(fingerprints, timeout=_slot_horizon_cache_timeout())
+
+
+
+def get_materialized_days(facility, days):
+    """
+    Returns the days whose slots are kept materialized by `refresh_slot_horizon`.
+    """
+    if not plugin_settings.SLOT_HORIZON_REFRESH_INTERVAL:
+        return set()
+
+    generation = _slot_horizon_generation(facility.id)
+    cache_keys = {_slot_horizon_cache_key(facility.id, generation, day): day for day in days}
+    return {cache_keys[key] for key in cache.get_many(cache_keys.keys())}
+
+
+
+def invalidate_slot_horizon(resource_id):
+    """
+    Forgets the materialized days of the resource's facility, so the
+    assignment path materializes them lazily again until the next
+    `refresh_slot_horizon` run picks up the change.
+
+    The facility is moved to a new generation rather than having its keys
+    deleted, so a refresh run that started before the change can't mark the
+    days as materialized again when it finishes.
+    """
+    facility_id = SchedulableResource.objects.filter(id=resource_id).values_list(
+        "facility_id", flat=True
+    ).first()
+    if facility_id is None:
+        return
+
+    cache.set(_slot_horizon_generation_key(facility_id), uuid.uuid4().hex, timeout=None)
+
+
+
+def _slot_horizon_generation_key(facility_id):
+    return f"care_quick_assign:slot_horizon_generation:{facility_id}"
+
+
+def _slot_horizon_generation(facility_id):
+    return cache.get(_slot_horizon_generation_key(facility_id), "0")
+
+
+def _slot_horizon_cache_key(facility_id, generation, day):
+    return f"care_quick_assign:slot_horizon:{facility_id}:{generation}:{day.isoformat()}"
+
+
+def _slot_horizon_cache_timeout():
+    # Entries outlive a couple of refresh runs, so the assignment path falls
+    # back to lazy materialization if the periodic task stops running.
+    return plugin_settings.SLOT_HORIZON_REFRESH_INTERVAL * 2
+
+
+def _slot_horizon_fingerprint(availabilities, exceptions):
+    parts = sorted(
+        f"a{availability.id}:{availability.modified_date}:{availability.schedule.modified_date}"
+        for availability in availabilities
+    ) + sorted(
+        f"e{exception.id}:{exception.modified_date}"
+        for exception in exceptions
+    )
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+
+
+def get_slots_for_day_handler(availabilities, exceptions, schedulable_resources, day, materialize=True):
+    if materialize:
+        # Materialization issues one INSERT per missing slot; it is accounted
+        # for in its own stage so it doesn't mask regressions in the reads.
+        # The slots are written to the primary, so they are built from the
+        # primary's availabilities and exceptions rather than the replica's.
+        with query_budget("materialize_slots"):
+            materialize_slots_for_day(
+                availabilities=availabilities.using(DEFAULT_DB_ALIAS),
+                exceptions=exceptions.using(DEFAULT_DB_ALIAS),
+                schedulable_resources=schedulable_resources,
+                day=day,
+            )
+
+    # Slots are materialized for whole days ahead of time, so those of the
+    # current day that already started are left out.
+    slots = TokenSlot.objects.filter(
+        start_datetime__date=day,
+        end_datetime__date=day,
+        start_datetime__gte=care_now(),
+        resource__in=schedulable_resources,
+        allocated__lt=F("availability__tokens_per_slot")
+    ).select_related(
+        "availability",
+        "availability__schedule",
+        "resource__user"
+    ).order_by(
+        "start_datetime"
+    )
+
+    return slots
+
+
+
+def materialize_slots_for_day(availabilities, exceptions, schedulable_resources, day):
     calculated_dow_availabilities = []
 
     for schedule_availability in availabilities:
@@ -150,10 +428,11 @@ def get_slots_for_day_handler(availabilities, exceptions, schedulable_resources,
             if day_availability["day_of_week"] == day.weekday():
                 calculated_dow_availabilities.append(
                     {
-                        "availability": day_availability,
+                        "start_time": day_availability["start_time"],
+                        "end_time": day_availability["end_time"],
                         "slot_size_in_minutes": schedule_availability.slot_size_in_minutes,
                         "availability_id": schedule_availability.id,
-                        "resource": schedule_availability.schedule.resource
+                        "resource_id": schedule_availability.schedule.resource_id
                     }
                 )
 
@@ -164,112 +443,95 @@ def get_slots_for_day_handler(availabilities, exceptions, schedulable_resources,
     )
 
 
+    facility_timezone = timezone.get_current_timezone()
+
     created_slots = TokenSlot.objects.filter(
         start_datetime__date=day,
         end_datetime__date=day,
         resource__in=schedulable_resources,
-    )
+    ).only("start_datetime", "end_datetime", "availability")
 
 
     for slot in created_slots:
-        slot_key = f"{timezone.make_naive(slot.start_datetime).time()}-{timezone.make_naive(slot.end_datetime).time()}"
+        slot_key = (
+            time_to_seconds(timezone.localtime(slot.start_datetime, facility_timezone)),
+            time_to_seconds(timezone.localtime(slot.end_datetime, facility_timezone)),
+        )
         if (
             slot_key in slots
-            and slots[slot_key]["availability_id"] == slot.availability.id
+            and slots[slot_key]["availability_id"] == slot.availability_id
         ):
             slots.pop(slot_key)
 
 
-    for _, slot in slots.items():
-        end_datetime = datetime.combine(
-            day, slot["end_time"], tzinfo=None
-        )
-        # Skip creating slots in the past
-        if end_datetime < timezone.make_naive(timezone.now()):
+    # Skip creating slots in the past
+    now = timezone.localtime(timezone.now(), facility_timezone)
+    if day < now.date():
+        return
+    past_cutoff = time_to_seconds(now) + now.microsecond / 1_000_000 if day == now.date() else 0
+
+    for slot in slots.values():
+        if slot["end"] < past_cutoff:
             continue
         TokenSlot.objects.create(
-            resource=slot["resource"],
-            start_datetime=datetime.combine(
-                day, slot["start_time"], tzinfo=None
+            resource_id=slot["resource_id"],
+            start_datetime=timezone.make_aware(
+                datetime.combine(day, seconds_to_time(slot["start"])), facility_timezone
+            ),
+            end_datetime=timezone.make_aware(
+                datetime.combine(day, seconds_to_time(slot["end"])), facility_timezone
             ),
-            end_datetime=end_datetime,
             availability_id=slot["availability_id"],
         )
 
 
-    slots = TokenSlot.objects.filter(
-        start_datetime__date=day,
-        end_datetime__date=day,
-        resource__in=schedulable_resources,
-        allocated__lt=F("availability__tokens_per_slot")
-    ).select_related(
-        "availability",
-        "availability__schedule"
-    ).order_by(
-        "start_datetime"
-    )
 
-    return slots
 
+def convert_availability_and_exceptions_to_slots(availabilities, exceptions, day):
+    """
+    Returns the slots of `day` keyed by their (start, end) seconds since
+    midnight, as built by `slot_engine.build_slots`.
+    """
+    exception_windows = [
+        (time_to_seconds(exception.start_time), time_to_seconds(exception.end_time))
+        for exception in exceptions
+    ]
+    return build_slots(
+        availabilities=availabilities,
+        exception_windows=exception_windows,
+        max_slots=settings.MAX_SLOTS_PER_AVAILABILITY,
+    )
 
 
 
-def convert_availability_and_exceptions_to_slots(availabilities, exceptions, day):
-    slots = {}
-    for availability in availabilities:
-        start_time = datetime.combine(
-            day,
-            time.fromisoformat(availability["availability"]["start_time"]),
-            tzinfo=None,
-        )
-        end_time = datetime.combine(
-            day,
-            time.fromisoformat(availability["availability"]["end_time"]),
-            tzinfo=None,
-        )
-        slot_size_in_minutes = availability["slot_size_in_minutes"]
-        availability_id = availability["availability_id"]
-        resource = availability["resource"]
-        current_time = start_time
-        i = 0
-        while current_time < end_time:
-            i += 1
-            if i == settings.MAX_SLOTS_PER_AVAILABILITY + 1:
-                break
-
-            conflicting = False
-            for exception in exceptions:
-                exception_start_time = datetime.combine(
-                    day, exception.start_time, tzinfo=None
-                )
-                exception_end_time = datetime.combine(
-                    day, exception.end_time, tzinfo=None
-                )
-                if (
-                    exception_start_time
-                    < (current_time + timedelta(minutes=slot_size_in_minutes))
-                ) and exception_end_time > current_time:
-                    conflicting = True
-
-            if not conflicting:
-                slots[
-                    f"{current_time.time()}-{(current_time + timedelta(minutes=slot_size_in_minutes)).time()}"
-                ] = {
-                    "start_time": current_time.time(),
-                    "end_time": (
-                        current_time + timedelta(minutes=slot_size_in_minutes)
-                    ).time(),
-                    "availability_id": availability_id,
-                    "resource": resource
-                }
-
-            current_time += timedelta(minutes=slot_size_in_minutes)
-    return slots
+def revalidate_slot_on_primary(slot):
+    """
+    Checks a slot planned from replica reads against the primary's exceptions,
+    so that replica lag can't book a slot an exception now blocks. Capacity is
+    enforced by the booking itself.
+    """
+    slot_start = timezone.localtime(slot.start_datetime)
+    slot_end = timezone.localtime(slot.end_datetime)
+    blocked = AvailabilityException.objects.using(DEFAULT_DB_ALIAS).filter(
+        resource_id=slot.resource_id,
+        valid_from__lte=slot_start.date(),
+        valid_to__gte=slot_start.date(),
+        start_time__lt=slot_end.time(),
+        end_time__gt=slot_start.time(),
+    ).exists()
+
+    if blocked:
+        raise ValidationError("The planned slot is blocked by an availability exception")
 
 
 
 def create_appointment_handler(slot, patient, user):
+    if not patient:
+        raise ValidationError("Patient not found")
+
     with transaction.atomic():
+        # The task runs after the registration commits, so staff may already
+        # have booked the patient by hand; the limit is checked for everyone.
         if (
             TokenBooking.objects.filter(
                 patient = patient,
@@ -282,9 +544,6 @@ def create_appointment_handler(slot, patient, user):
             error = f"Patient already has maximum number of appointments ({settings.MAX_APPOINTMENTS_PER_PATIENT})"
             raise ValidationError(error)
 
-        if not patient:
-            raise ValidationError("Patient not found")
-
         note = "This appointment was automatically generated using quick auto-assign feature."
         appointment = lock_create_appointment(slot, patient, user, note)
 
@@ -4,6 +4,7 @@ from rest_framework.routers import DefaultRouter, SimpleRouter
 
 from care_quick_assign.api.viewsets.assignment_config import AutoAssignmentConfigViewSet
 from care_quick_assign.api.viewsets.assignment import AssignmentViewSet
+from care_quick_assign.api.viewsets.assignment_profile import AssignmentProfileViewSet
 
 router = DefaultRouter() if settings.DEBUG else SimpleRouter()
 
@@ -11,4 +12,6 @@ router.register("assignments", AssignmentViewSet, basename="assignments")
 
 router.register("auto-assignment", AutoAssignmentConfigViewSet, basename="config")
 
+router.register("assignment-profiles", AssignmentProfileViewSet, basename="assignment-profiles")
+
 urlpatterns = router.urls
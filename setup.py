@@ -16,7 +16,7 @@ requirements = [
     "djangorestframework",
 ]
 
-test_requirements = []
+test_requirements = ["hypothesis", "model_bakery"]
 
 setup(
     author="Open Healthcare Network",
@@ -0,0 +1,106 @@
+"""Query budget tests for the `create_quick_assignment` task."""
+
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from model_bakery import baker
+
+from care.emr.models.patient import Patient
+from care.emr.models.scheduling import SchedulableResource
+from care.emr.models.scheduling.schedule import Availability, Schedule
+from care.facility.models.facility import Facility
+from care.users.models import User
+from care.utils.time_util import care_now
+
+from care_quick_assign.config_resolver import invalidate_assignment_configs
+from care_quick_assign.instrumentation import QueryBudgetExceeded
+from care_quick_assign.models.auto_assignment_config import AutoAssignmentConfig
+from care_quick_assign.models.auto_assignment_event import AutoAssignmentEvent, AutoAssignmentEventStatus
+from care_quick_assign.tasks import create_quick_assignment, refresh_slot_horizon
+
+
+STRICT_BUDGETS = {
+    "CACHES": {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    "PLUGIN_CONFIGS": {"care_quick_assign": {"QUERY_BUDGET_STRICT": True}},
+}
+
+
+@override_settings(**STRICT_BUDGETS)
+class TestAssignmentQueryBudget(TestCase):
+    """Runs the assignment task with the QUERY_BUDGETS defaults in strict mode."""
+
+    def setUp(self):
+        self.user = baker.make(User)
+        self.facility = baker.make(Facility)
+        resource = baker.make(
+            SchedulableResource,
+            facility=self.facility,
+            resource_type="practitioner",
+            user=self.user,
+        )
+        schedule = baker.make(
+            Schedule,
+            resource=resource,
+            valid_from=care_now() - timedelta(days=1),
+            valid_to=care_now() + timedelta(days=30),
+        )
+        baker.make(
+            Availability,
+            schedule=schedule,
+            slot_type="appointment",
+            slot_size_in_minutes=30,
+            tokens_per_slot=10,
+            availability=[
+                {"day_of_week": day_of_week, "start_time": "08:00:00", "end_time": "12:00:00"}
+                for day_of_week in range(7)
+            ],
+        )
+        AutoAssignmentConfig.objects.create(enabled=True, max_patients_per_staff=10, window_size=3)
+        # The post_save hook invalidates the resolved configs on commit, which
+        # never happens inside a TestCase.
+        invalidate_assignment_configs()
+
+    def make_patient(self):
+        return baker.make(
+            Patient,
+            geo_organization=self.facility.geo_organization,
+            created_by=self.user,
+        )
+
+    def assert_assigned(self, patient):
+        event = AutoAssignmentEvent.objects.get(patient=patient)
+        self.assertEqual(event.status, AutoAssignmentEventStatus.SUCCESS, event.failure_reason)
+
+    def test_stays_within_budget_with_lazy_materialization(self):
+        patient = self.make_patient()
+
+        create_quick_assignment(patient.external_id, None)
+
+        self.assert_assigned(patient)
+
+    def test_stays_within_budget_with_materialized_horizon(self):
+        refresh_slot_horizon()
+        patient = self.make_patient()
+
+        create_quick_assignment(patient.external_id, None)
+
+        self.assert_assigned(patient)
+
+    @override_settings(
+        PLUGIN_CONFIGS={
+            "care_quick_assign": {
+                "QUERY_BUDGET_STRICT": True,
+                "QUERY_BUDGETS": {"book_appointment": 0, "log_result": 0},
+            }
+        }
+    )
+    def test_violation_is_raised_after_the_assignment_completes(self):
+        patient = self.make_patient()
+
+        with self.assertRaises(QueryBudgetExceeded) as raised:
+            create_quick_assignment(patient.external_id, None)
+
+        # The booking and its logged result stand; only the violation is reported.
+        self.assert_assigned(patient)
+        self.assertIn("book_appointment", str(raised.exception))
+        self.assertIn("log_result", str(raised.exception))
@@ -0,0 +1,91 @@
+"""Tests for `care_quick_assign.config_resolver`."""
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from model_bakery import baker
+
+from care.facility.models.facility import Facility
+
+from care_quick_assign.config_resolver import (
+    CONFIG_VERSION_CACHE_KEY,
+    has_enabled_assignment_config,
+    invalidate_assignment_configs,
+    resolve_assignment_config,
+)
+from care_quick_assign.models.auto_assignment_config import AutoAssignmentConfig
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TestResolveAssignmentConfig(TestCase):
+    """Tests for `care_quick_assign.config_resolver.resolve_assignment_config`."""
+
+    def setUp(self):
+        cache.clear()
+        invalidate_assignment_configs()
+        self.facility = baker.make(Facility)
+        self.other_facility = baker.make(Facility)
+
+    def make_config(self, facility=None, enabled=True, window_size=1):
+        config = AutoAssignmentConfig.objects.create(
+            facility=facility,
+            enabled=enabled,
+            max_patients_per_staff=10,
+            window_size=window_size,
+        )
+        # The post_save hook invalidates on commit, which never happens here.
+        invalidate_assignment_configs()
+        return config
+
+    def test_nothing_configured(self):
+        self.assertEqual(resolve_assignment_config(self.facility.id), (False, None))
+        self.assertEqual(resolve_assignment_config(None), (False, None))
+        self.assertFalse(has_enabled_assignment_config())
+
+    def test_falls_back_to_global_config(self):
+        self.make_config(window_size=3)
+
+        enabled, config = resolve_assignment_config(self.facility.id)
+
+        self.assertTrue(enabled)
+        self.assertEqual(config["window_size"], 3)
+        self.assertTrue(has_enabled_assignment_config())
+
+    def test_facility_config_overrides_global_config(self):
+        self.make_config(window_size=3)
+        self.make_config(facility=self.facility, window_size=5)
+
+        self.assertEqual(resolve_assignment_config(self.facility.id)[1]["window_size"], 5)
+        self.assertEqual(resolve_assignment_config(self.other_facility.id)[1]["window_size"], 3)
+
+    def test_disabled_facility_config_overrides_enabled_global_config(self):
+        self.make_config()
+        self.make_config(facility=self.facility, enabled=False)
+
+        self.assertFalse(resolve_assignment_config(self.facility.id)[0])
+        self.assertTrue(resolve_assignment_config(self.other_facility.id)[0])
+
+    def test_enabled_facility_config_without_global_config(self):
+        self.make_config(facility=self.facility)
+
+        self.assertTrue(resolve_assignment_config(self.facility.id)[0])
+        self.assertEqual(resolve_assignment_config(self.other_facility.id), (False, None))
+        self.assertTrue(has_enabled_assignment_config())
+
+    def test_resolves_without_queries_until_invalidated(self):
+        self.make_config()
+        resolve_assignment_config(self.facility.id)
+
+        with self.assertNumQueries(0):
+            resolve_assignment_config(self.facility.id)
+
+    def test_rebuilds_after_another_process_invalidates(self):
+        self.make_config(window_size=3)
+        self.assertEqual(resolve_assignment_config(self.facility.id)[1]["window_size"], 3)
+
+        AutoAssignmentConfig.objects.create(facility=self.facility, enabled=True, max_patients_per_staff=10, window_size=5)
+        # Still served from the map built before the change.
+        self.assertEqual(resolve_assignment_config(self.facility.id)[1]["window_size"], 3)
+
+        # Another process invalidating only reaches this one through the cache.
+        cache.set(CONFIG_VERSION_CACHE_KEY, "changed-elsewhere", timeout=None)
+        self.assertEqual(resolve_assignment_config(self.facility.id)[1]["window_size"], 5)
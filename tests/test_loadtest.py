@@ -0,0 +1,24 @@
+"""Tests for the `quick_assign_loadtest` management command."""
+
+import unittest
+
+from care_quick_assign.management.commands.quick_assign_loadtest import percentile
+
+
+class TestPercentile(unittest.TestCase):
+    """Tests for the nearest-rank `percentile` helper."""
+
+    def test_nearest_rank(self):
+        values = [1, 2, 3, 4, 5]
+
+        self.assertEqual(percentile(values, 50), 3)
+        self.assertEqual(percentile(values, 90), 5)
+        self.assertEqual(percentile(values, 20), 1)
+        self.assertEqual(percentile(values, 21), 2)
+
+    def test_even_number_of_values(self):
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2)
+        self.assertEqual(percentile([1, 2, 3, 4], 99), 4)
+
+    def test_no_values(self):
+        self.assertIsNone(percentile([], 50))
@@ -0,0 +1,62 @@
+"""Tests for `care_quick_assign.notifications`."""
+
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from care_quick_assign.notifications import (
+    _finalized_cache_key,
+    clear_assignment_finalized,
+    notify_assignment_finalized,
+    wait_for_assignment_finalized,
+)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    PLUGIN_CONFIGS={"care_quick_assign": {"ASSIGNMENT_STATUS_CACHE_POLL_INTERVAL": 0.05}},
+)
+class TestAssignmentNotifications(SimpleTestCase):
+    """Tests for the assignment finalization pub/sub."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_returns_immediately_when_already_final(self):
+        notify_assignment_finalized(1, "SUCCESS")
+
+        started_at = time.monotonic()
+        self.assertTrue(wait_for_assignment_finalized(1, timeout=5))
+        self.assertLess(time.monotonic() - started_at, 1)
+
+    def test_wakes_when_finalized_while_waiting(self):
+        timer = threading.Timer(0.1, notify_assignment_finalized, args=(2, "FAILED"))
+        timer.start()
+        try:
+            started_at = time.monotonic()
+            self.assertTrue(wait_for_assignment_finalized(2, timeout=5))
+            self.assertLess(time.monotonic() - started_at, 1)
+        finally:
+            timer.cancel()
+
+    def test_sees_finalization_published_by_another_process(self):
+        # Another process only reaches this one through the shared cache.
+        timer = threading.Timer(0.1, cache.set, args=(_finalized_cache_key(3), "SUCCESS"))
+        timer.start()
+        try:
+            self.assertTrue(wait_for_assignment_finalized(3, timeout=5))
+        finally:
+            timer.cancel()
+
+    def test_times_out_while_pending(self):
+        started_at = time.monotonic()
+        self.assertFalse(wait_for_assignment_finalized(4, timeout=0.2))
+        self.assertGreaterEqual(time.monotonic() - started_at, 0.2)
+
+    def test_clear_forgets_previous_finalization(self):
+        notify_assignment_finalized(5, "FAILED")
+        clear_assignment_finalized(5)
+
+        self.assertFalse(wait_for_assignment_finalized(5, timeout=0.1))
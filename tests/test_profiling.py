@@ -0,0 +1,73 @@
+"""Tests for `care_quick_assign.profiling`."""
+
+import os
+import pstats
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from model_bakery import baker
+
+from care.emr.models.patient import Patient
+
+from care_quick_assign.models.assignment_profile import AssignmentProfile
+from care_quick_assign.profiling import dump_profile, format_profile, profile_assignment
+
+
+def profiled_work():
+    return sum(i * i for i in range(1000))
+
+
+class ActiveProfiler:
+    """Stands in for cProfile.Profile while another profiler is active."""
+
+    def enable(self):
+        raise ValueError("Another profiling tool is already active")
+
+
+class TestProfileAssignment(SimpleTestCase):
+    """Tests for `care_quick_assign.profiling.profile_assignment`."""
+
+    @mock.patch("care_quick_assign.profiling.should_profile", return_value=True)
+    @mock.patch("care_quick_assign.profiling.cProfile.Profile", ActiveProfiler)
+    def test_runs_unprofiled_when_another_profiler_is_active(self, should_profile):
+        ran = False
+        with self.assertLogs("care_quick_assign.profiling", level="WARNING") as logs:
+            with profile_assignment(SimpleNamespace(id=1), facility=None):
+                ran = True
+
+        self.assertTrue(ran)
+        self.assertIn("running it unprofiled", logs.output[0])
+
+
+class TestStoredProfile(TestCase):
+    """Tests for storing and reading back assignment profiles."""
+
+    @mock.patch("care_quick_assign.profiling.should_profile", return_value=True)
+    def setUp(self, should_profile):
+        self.patient = baker.make(Patient)
+        with profile_assignment(self.patient, facility=None):
+            profiled_work()
+        self.profile = AssignmentProfile.objects.get(patient=self.patient)
+
+    def test_stores_a_profile(self):
+        self.assertIsNone(self.profile.facility)
+        self.assertGreaterEqual(self.profile.duration_ms, 0)
+
+    def test_dump_loads_through_pstats(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "assignment.prof")
+            with open(path, "wb") as prof_file:
+                prof_file.write(dump_profile(self.profile))
+
+            stats = pstats.Stats(path)
+
+        self.assertGreater(stats.total_calls, 0)
+        self.assertTrue(any(function == "profiled_work" for _, _, function in stats.stats))
+
+    def test_formats_a_report(self):
+        report = format_profile(self.profile, sort="cumulative", limit=10)
+
+        self.assertIn("function calls", report)
+        self.assertIn("profiled_work", report)
@@ -0,0 +1,77 @@
+"""Tests for the query budget guard of the assignment task."""
+
+import functools
+
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+
+from care_quick_assign.instrumentation import QueryBudgetExceeded, enforce_query_budgets, query_budget
+
+
+def run_fake_query(sql="SELECT 1"):
+    """Runs a query through the installed execute wrappers without a database."""
+    def execute(sql, params, many, context):
+        return None
+
+    for wrapper in reversed(connection.execute_wrappers):
+        execute = functools.partial(wrapper, execute)
+    return execute(sql, (), False, {})
+
+
+class TestQueryBudget(SimpleTestCase):
+    """Tests for `care_quick_assign.instrumentation.query_budget`."""
+
+    def test_counts_queries_within_budget(self):
+        with query_budget("stage", budget=2) as stage:
+            run_fake_query()
+            run_fake_query()
+
+        self.assertEqual(stage.query_count, 2)
+        self.assertFalse(stage.over_budget)
+
+    def test_logs_call_sites_when_budget_exceeded(self):
+        with self.assertLogs("care_quick_assign.instrumentation", level="WARNING") as logs:
+            with query_budget("stage", budget=1):
+                run_fake_query()
+                run_fake_query()
+
+        self.assertIn("Stage 'stage' ran 2 queries, exceeding its budget of 1", logs.output[0])
+        self.assertIn("test_query_budget.py", logs.output[0])
+
+    @override_settings(PLUGIN_CONFIGS={"care_quick_assign": {"QUERY_BUDGET_STRICT": True}})
+    def test_raises_in_strict_mode(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            with query_budget("stage", budget=0):
+                run_fake_query()
+
+    @override_settings(PLUGIN_CONFIGS={"care_quick_assign": {"QUERY_BUDGET_STRICT": True}})
+    def test_defers_strict_violations_to_the_end_of_the_block(self):
+        completed_stages = []
+        with self.assertRaises(QueryBudgetExceeded) as raised:
+            with enforce_query_budgets():
+                for name in ("first", "second"):
+                    with query_budget(name, budget=0):
+                        run_fake_query()
+                    completed_stages.append(name)
+
+        self.assertEqual(completed_stages, ["first", "second"])
+        self.assertIn("Stage 'first'", str(raised.exception))
+        self.assertIn("Stage 'second'", str(raised.exception))
+
+    @override_settings(PLUGIN_CONFIGS={"care_quick_assign": {"QUERY_BUDGETS": {"stage": 1}}})
+    def test_uses_configured_budget(self):
+        with query_budget("stage") as stage:
+            pass
+
+        self.assertEqual(stage.budget, 1)
+
+    def test_attributes_queries_to_innermost_stage(self):
+        with query_budget("outer", budget=1) as outer:
+            run_fake_query()
+            with query_budget("inner") as inner:
+                run_fake_query()
+                run_fake_query()
+
+        self.assertEqual(outer.query_count, 1)
+        self.assertEqual(inner.query_count, 2)
+        self.assertEqual(connection.execute_wrappers, [])
@@ -0,0 +1,133 @@
+"""Tests for `care_quick_assign.retention`."""
+
+import gzip
+import json
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+from model_bakery import baker
+
+from care.users.models import User
+from care.utils.time_util import care_now
+
+from care_quick_assign.models.auto_assignment_event import AutoAssignmentEvent, AutoAssignmentEventStatus
+from care_quick_assign.models.auto_assignment_event_rollup import AutoAssignmentEventRollup
+from care_quick_assign.retention import (
+    ARCHIVED_FIELDS,
+    PARTIAL_SUFFIX,
+    _recover_partial_archives,
+    _write_partial_archive,
+    purge_successful_events,
+)
+
+
+class TestPurgeSuccessfulEvents(TestCase):
+    """Tests for `care_quick_assign.retention.purge_successful_events`."""
+
+    def setUp(self):
+        self.staff = baker.make(User)
+        self.completed_at = care_now() - timedelta(days=100)
+        archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(archive_dir.cleanup)
+        self.archive_dir = archive_dir.name
+
+    def make_event(self, status=AutoAssignmentEventStatus.SUCCESS, completed_at=None, **fields):
+        if status == AutoAssignmentEventStatus.SUCCESS:
+            fields["assigned_staff"] = self.staff
+        if status == AutoAssignmentEventStatus.FAILED:
+            fields["failure_reason"] = "No suitable slot found"
+        if status != AutoAssignmentEventStatus.PENDING:
+            fields["completed_at"] = completed_at or self.completed_at
+        return baker.make(AutoAssignmentEvent, status=status, **fields)
+
+    def archived_event_ids(self):
+        event_ids = []
+        for filename in sorted(os.listdir(self.archive_dir)):
+            with gzip.open(os.path.join(self.archive_dir, filename), "rt", encoding="utf-8") as archive:
+                event_ids.extend(json.loads(line)["id"] for line in archive)
+        return event_ids
+
+    def test_purges_only_expired_successful_events(self):
+        expired = self.make_event()
+        recent = self.make_event(completed_at=care_now() - timedelta(days=10))
+        failed = self.make_event(status=AutoAssignmentEventStatus.FAILED)
+        pending = self.make_event(status=AutoAssignmentEventStatus.PENDING)
+
+        purged = purge_successful_events(retention_days=90, batch_size=10)
+
+        self.assertEqual(purged, 1)
+        self.assertFalse(AutoAssignmentEvent.objects.filter(id=expired.id).exists())
+        self.assertEqual(
+            set(AutoAssignmentEvent.objects.values_list("id", flat=True)),
+            {recent.id, failed.id, pending.id},
+        )
+
+    def test_dry_run_only_counts(self):
+        self.make_event()
+
+        self.assertEqual(purge_successful_events(retention_days=90, batch_size=10, dry_run=True), 1)
+        self.assertEqual(AutoAssignmentEvent.objects.count(), 1)
+
+    def test_rollups_accumulate_across_batches_and_runs(self):
+        for execution_time_ms, retry_count in [(100, 0), (200, 1), (300, 2)]:
+            self.make_event(execution_time_ms=execution_time_ms, retry_count=retry_count)
+
+        self.assertEqual(purge_successful_events(retention_days=90, batch_size=2), 3)
+
+        self.make_event(execution_time_ms=400, retry_count=1)
+        self.assertEqual(purge_successful_events(retention_days=90, batch_size=2), 1)
+
+        rollup = AutoAssignmentEventRollup.objects.get()
+        self.assertEqual(rollup.day, timezone.localtime(self.completed_at).date())
+        self.assertEqual(rollup.event_count, 4)
+        self.assertEqual(rollup.total_execution_time_ms, 1000)
+        self.assertEqual(rollup.max_execution_time_ms, 400)
+        self.assertEqual(rollup.total_retry_count, 4)
+
+    def test_archives_each_batch_once_committed(self):
+        event_ids = [self.make_event().id for _ in range(3)]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_successful_events(retention_days=90, batch_size=2, archive_dir=self.archive_dir)
+
+        filenames = os.listdir(self.archive_dir)
+        self.assertEqual(len(filenames), 2)
+        self.assertFalse(any(filename.endswith(PARTIAL_SUFFIX) for filename in filenames))
+        self.assertEqual(self.archived_event_ids(), event_ids)
+
+    def test_failed_batch_is_rolled_back_without_archive(self):
+        event = self.make_event()
+
+        with mock.patch("care_quick_assign.retention._rollup_batch", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                purge_successful_events(retention_days=90, batch_size=10, archive_dir=self.archive_dir)
+
+        self.assertTrue(AutoAssignmentEvent.objects.filter(id=event.id).exists())
+        self.assertFalse(AutoAssignmentEventRollup.objects.exists())
+        self.assertEqual(os.listdir(self.archive_dir), [])
+
+    def test_discards_partial_archive_of_events_still_stored(self):
+        event = self.make_event()
+        _write_partial_archive(
+            self.archive_dir, list(AutoAssignmentEvent.objects.filter(id=event.id).values(*ARCHIVED_FIELDS))
+        )
+
+        _recover_partial_archives(self.archive_dir)
+
+        self.assertEqual(os.listdir(self.archive_dir), [])
+
+    def test_completes_partial_archive_of_deleted_events(self):
+        event = self.make_event()
+        path = _write_partial_archive(
+            self.archive_dir, list(AutoAssignmentEvent.objects.filter(id=event.id).values(*ARCHIVED_FIELDS))
+        )
+        AutoAssignmentEvent.objects.filter(id=event.id).delete()
+
+        _recover_partial_archives(self.archive_dir)
+
+        self.assertEqual(os.listdir(self.archive_dir), [os.path.basename(path)[: -len(PARTIAL_SUFFIX)]])
+        self.assertEqual(self.archived_event_ids(), [event.id])
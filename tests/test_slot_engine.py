@@ -0,0 +1,146 @@
+"""Tests for `care_quick_assign.slot_engine`."""
+
+import unittest
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+
+from hypothesis import given, settings, strategies as st
+
+from care_quick_assign.slot_engine import build_slots, seconds_to_time, time_to_seconds
+
+
+def reference_slots(availabilities, exceptions, day, max_slots):
+    """The datetime based slot generation the engine replaces."""
+    slots = {}
+    for availability in availabilities:
+        start_time = datetime.combine(day, time.fromisoformat(availability["start_time"]))
+        end_time = datetime.combine(day, time.fromisoformat(availability["end_time"]))
+        slot_size_in_minutes = availability["slot_size_in_minutes"]
+        current_time = start_time
+        i = 0
+        while current_time < end_time:
+            i += 1
+            if i == max_slots + 1:
+                break
+
+            conflicting = False
+            for exception in exceptions:
+                exception_start_time = datetime.combine(day, exception.start_time)
+                exception_end_time = datetime.combine(day, exception.end_time)
+                if (
+                    exception_start_time
+                    < (current_time + timedelta(minutes=slot_size_in_minutes))
+                ) and exception_end_time > current_time:
+                    conflicting = True
+
+            if not conflicting:
+                slots[
+                    f"{current_time.time()}-{(current_time + timedelta(minutes=slot_size_in_minutes)).time()}"
+                ] = {
+                    "start_time": current_time.time(),
+                    "end_time": (current_time + timedelta(minutes=slot_size_in_minutes)).time(),
+                    "availability_id": availability["availability_id"],
+                    "resource_id": availability["resource_id"],
+                }
+
+            current_time += timedelta(minutes=slot_size_in_minutes)
+    return slots
+
+
+def engine_slots(availabilities, exceptions, max_slots):
+    exception_windows = [
+        (time_to_seconds(exception.start_time), time_to_seconds(exception.end_time))
+        for exception in exceptions
+    ]
+    slots = build_slots(availabilities, exception_windows, max_slots)
+    return {
+        f"{seconds_to_time(start)}-{seconds_to_time(end)}": {
+            "start_time": seconds_to_time(slot["start"]),
+            "end_time": seconds_to_time(slot["end"]),
+            "availability_id": slot["availability_id"],
+            "resource_id": slot["resource_id"],
+        }
+        for (start, end), slot in slots.items()
+    }
+
+
+times = st.times().map(lambda value: value.replace(microsecond=0))
+
+availabilities = st.lists(
+    st.builds(
+        lambda window, slot_size, availability_id: {
+            "start_time": min(window).isoformat(),
+            "end_time": max(window).isoformat(),
+            "slot_size_in_minutes": slot_size,
+            "availability_id": availability_id,
+            "resource_id": availability_id,
+        },
+        st.tuples(times, times),
+        st.integers(min_value=1, max_value=240),
+        st.integers(min_value=1, max_value=5),
+    ),
+    max_size=4,
+)
+
+exceptions = st.lists(
+    st.tuples(times, times).map(
+        lambda window: SimpleNamespace(start_time=min(window), end_time=max(window))
+    ),
+    max_size=3,
+)
+
+
+class TestSlotEngine(unittest.TestCase):
+    """Tests for the integer slot engine."""
+
+    @settings(max_examples=300, deadline=None)
+    @given(
+        availabilities=availabilities,
+        exceptions=exceptions,
+        max_slots=st.integers(min_value=0, max_value=200),
+    )
+    def test_matches_datetime_implementation(self, availabilities, exceptions, max_slots):
+        self.assertEqual(
+            engine_slots(availabilities, exceptions, max_slots),
+            reference_slots(availabilities, exceptions, date(2026, 3, 2), max_slots),
+        )
+
+    def test_slot_crossing_midnight_wraps_end(self):
+        slots = build_slots(
+            [
+                {
+                    "start_time": "23:30:00",
+                    "end_time": "23:59:00",
+                    "slot_size_in_minutes": 20,
+                    "availability_id": 1,
+                    "resource_id": 1,
+                }
+            ],
+            exception_windows=[],
+            max_slots=10,
+        )
+
+        self.assertEqual(
+            [(seconds_to_time(start), seconds_to_time(end)) for start, end in slots],
+            [(time(23, 30), time(23, 50)), (time(23, 50), time(0, 10))],
+        )
+
+    def test_exception_blocks_overlapping_slots(self):
+        slots = build_slots(
+            [
+                {
+                    "start_time": "09:00",
+                    "end_time": "10:00",
+                    "slot_size_in_minutes": 15,
+                    "availability_id": 1,
+                    "resource_id": 1,
+                }
+            ],
+            exception_windows=[(time_to_seconds(time(9, 20)), time_to_seconds(time(9, 30)))],
+            max_slots=10,
+        )
+
+        self.assertEqual(
+            [seconds_to_time(start) for start, _ in slots],
+            [time(9, 0), time(9, 30), time(9, 45)],
+        )
@@ -0,0 +1,53 @@
+"""Tests for the slot horizon bookkeeping of `care_quick_assign.tasks`."""
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from model_bakery import baker
+
+from care.emr.models.scheduling import SchedulableResource
+from care.facility.models.facility import Facility
+
+from care_quick_assign.tasks import (
+    _slot_horizon_cache_key,
+    _slot_horizon_generation,
+    get_materialized_days,
+    invalidate_slot_horizon,
+    refresh_slot_horizon_for_facility,
+)
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TestSlotHorizon(TestCase):
+    """Tests for the materialized days of a facility."""
+
+    def setUp(self):
+        cache.clear()
+        self.facility = baker.make(Facility)
+        self.resource = baker.make(
+            SchedulableResource,
+            facility=self.facility,
+            resource_type="practitioner",
+        )
+        self.days = [timezone.localdate() + timezone.timedelta(days=day_offset) for day_offset in range(3)]
+
+    def test_refresh_marks_the_window_materialized(self):
+        refresh_slot_horizon_for_facility(self.facility, window_size=3)
+
+        self.assertEqual(get_materialized_days(self.facility, self.days), set(self.days))
+
+    def test_invalidation_drops_materialized_days(self):
+        refresh_slot_horizon_for_facility(self.facility, window_size=3)
+
+        invalidate_slot_horizon(self.resource.id)
+
+        self.assertEqual(get_materialized_days(self.facility, self.days), set())
+
+    def test_refresh_started_before_invalidation_is_ignored(self):
+        # A run reads the generation before the schedules; the change commits
+        # and invalidates while it runs, then the run records its days.
+        generation = _slot_horizon_generation(self.facility.id)
+        invalidate_slot_horizon(self.resource.id)
+        cache.set_many({_slot_horizon_cache_key(self.facility.id, generation, day): "stale" for day in self.days})
+
+        self.assertEqual(get_materialized_days(self.facility, self.days), set())